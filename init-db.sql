@@ -4,22 +4,59 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
--- Drop existing types if they exist (for clean recreation)
+-- Drop the old enum types if they exist (status columns are SMALLINT now)
 DROP TYPE IF EXISTS agent_status_enum CASCADE;
 DROP TYPE IF EXISTS call_status_enum CASCADE;
 DROP TYPE IF EXISTS qualification_result_enum CASCADE;
 DROP TYPE IF EXISTS assignment_status_enum CASCADE;
 
--- Create custom types with exact enum values from Python
-CREATE TYPE agent_status_enum AS ENUM ('AVAILABLE', 'BUSY', 'PAUSED', 'OFFLINE');
-CREATE TYPE call_status_enum AS ENUM ('PENDING', 'ASSIGNED', 'IN_PROGRESS', 'COMPLETED', 'ABANDONED', 'FAILED');
-CREATE TYPE qualification_result_enum AS ENUM ('OK', 'KO', 'PENDING');
-CREATE TYPE assignment_status_enum AS ENUM ('PENDING', 'ACTIVE', 'COMPLETED', 'FAILED');
+-- Status columns are stored as SMALLINT codes (see the StatusCode type in
+-- src/infrastructure/database/models.py; codes follow Python declaration order):
+--   agent_status:         0=AVAILABLE, 1=BUSY, 2=PAUSED, 3=OFFLINE
+--   call_status:          0=PENDING, 1=ASSIGNED, 2=IN_PROGRESS, 3=COMPLETED, 4=ABANDONED, 5=FAILED
+--   qualification_result: 0=OK, 1=KO, 2=PENDING
+--   assignment_status:    0=PENDING, 1=ACTIVE, 2=COMPLETED, 3=FAILED
+-- The lookup tables below carry the same mapping for BI joins.
+
+DROP TABLE IF EXISTS agent_status CASCADE;
+DROP TABLE IF EXISTS call_status CASCADE;
+DROP TABLE IF EXISTS qualification_result CASCADE;
+DROP TABLE IF EXISTS assignment_status CASCADE;
+
+CREATE TABLE agent_status (
+    id SMALLINT PRIMARY KEY,
+    name VARCHAR(50) NOT NULL UNIQUE
+);
+INSERT INTO agent_status (id, name) VALUES
+    (0, 'AVAILABLE'), (1, 'BUSY'), (2, 'PAUSED'), (3, 'OFFLINE');
+
+CREATE TABLE call_status (
+    id SMALLINT PRIMARY KEY,
+    name VARCHAR(50) NOT NULL UNIQUE
+);
+INSERT INTO call_status (id, name) VALUES
+    (0, 'PENDING'), (1, 'ASSIGNED'), (2, 'IN_PROGRESS'),
+    (3, 'COMPLETED'), (4, 'ABANDONED'), (5, 'FAILED');
+
+CREATE TABLE qualification_result (
+    id SMALLINT PRIMARY KEY,
+    name VARCHAR(50) NOT NULL UNIQUE
+);
+INSERT INTO qualification_result (id, name) VALUES
+    (0, 'OK'), (1, 'KO'), (2, 'PENDING');
+
+CREATE TABLE assignment_status (
+    id SMALLINT PRIMARY KEY,
+    name VARCHAR(50) NOT NULL UNIQUE
+);
+INSERT INTO assignment_status (id, name) VALUES
+    (0, 'PENDING'), (1, 'ACTIVE'), (2, 'COMPLETED'), (3, 'FAILED');
 
 -- Tenants table (for multi-tenant support)
 CREATE TABLE IF NOT EXISTS tenants (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     name VARCHAR(255) NOT NULL UNIQUE,
+    tier VARCHAR(50) NOT NULL DEFAULT 'standard',
     configuration JSONB DEFAULT '{}',
     is_active BOOLEAN DEFAULT true,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -39,7 +76,7 @@ CREATE TABLE agents (
     tenant_id UUID REFERENCES tenants(id) ON DELETE CASCADE DEFAULT '00000000-0000-0000-0000-000000000001'::UUID,
     name VARCHAR(255) NOT NULL,
     agent_type VARCHAR(50) NOT NULL,
-    status agent_status_enum NOT NULL DEFAULT 'OFFLINE',
+    status SMALLINT NOT NULL DEFAULT 3 REFERENCES agent_status(id),  -- 3 = OFFLINE
     last_call_end_time TIMESTAMP WITH TIME ZONE,
     current_call_id UUID,
     capabilities JSONB DEFAULT '{}',
@@ -53,9 +90,10 @@ CREATE TABLE calls (
     tenant_id UUID REFERENCES tenants(id) ON DELETE CASCADE DEFAULT '00000000-0000-0000-0000-000000000001'::UUID,
     phone_number VARCHAR(50) NOT NULL,
     call_type VARCHAR(50) NOT NULL,
-    status call_status_enum NOT NULL DEFAULT 'PENDING',
+    status SMALLINT NOT NULL DEFAULT 0 REFERENCES call_status(id),  -- 0 = PENDING
     assigned_agent_id UUID REFERENCES agents(id) ON DELETE SET NULL,
-    qualification_result qualification_result_enum NOT NULL DEFAULT 'PENDING',
+    agent_type VARCHAR(50),  -- Denormalized from the assigned agent
+    qualification_result SMALLINT NOT NULL DEFAULT 2 REFERENCES qualification_result(id),  -- 2 = PENDING
     priority INTEGER DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     assigned_at TIMESTAMP WITH TIME ZONE,
@@ -71,7 +109,7 @@ CREATE TABLE assignments (
     tenant_id UUID REFERENCES tenants(id) ON DELETE CASCADE DEFAULT '00000000-0000-0000-0000-000000000001'::UUID,
     call_id UUID REFERENCES calls(id) ON DELETE CASCADE,
     agent_id UUID REFERENCES agents(id) ON DELETE CASCADE,
-    status assignment_status_enum NOT NULL DEFAULT 'PENDING',
+    status SMALLINT NOT NULL DEFAULT 0 REFERENCES assignment_status(id),  -- 0 = PENDING
     assignment_time_ms REAL,
     expected_duration_seconds REAL,
     actual_duration_seconds REAL,
@@ -111,16 +149,16 @@ CREATE TABLE test_runs (
 
 -- Performance indexes for high-throughput queries
 -- Agents indexes
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_agents_tenant_status 
-    ON agents (tenant_id, status) 
-    WHERE status = 'AVAILABLE';
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_agents_tenant_status
+    ON agents (tenant_id, status)
+    WHERE status = 0;  -- AVAILABLE
 
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_agents_tenant_type 
     ON agents (tenant_id, agent_type);
 
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_agents_idle_time 
-    ON agents (tenant_id, last_call_end_time ASC NULLS FIRST) 
-    WHERE status = 'AVAILABLE';
+    ON agents (tenant_id, last_call_end_time ASC NULLS FIRST)
+    WHERE status = 0;  -- AVAILABLE
 
 -- Calls indexes
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_calls_tenant_status 
@@ -130,8 +168,8 @@ CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_calls_tenant_type
     ON calls (tenant_id, call_type);
 
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_calls_pending 
-    ON calls (tenant_id, created_at) 
-    WHERE status = 'PENDING';
+    ON calls (tenant_id, created_at)
+    WHERE status = 0;  -- PENDING
 
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_calls_completion 
     ON calls (tenant_id, completed_at) 
@@ -155,9 +193,75 @@ CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_assignments_performance
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_metrics_tenant_type 
     ON system_metrics (tenant_id, metric_type, recorded_at);
 
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_metrics_name_time 
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_metrics_name_time
     ON system_metrics (metric_name, recorded_at);
 
+-- Indexes mirrored from the SQLAlchemy models (models.py); create_all
+-- skips tables that already exist, so the docker path must create these
+-- here. Names match the model definitions.
+
+-- Availability lookups only touch non-terminal statuses
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_agents_status_agent_type
+    ON agents (status, agent_type)
+    WHERE status IN (0, 2);  -- AVAILABLE, PAUSED
+
+-- @>-only GIN indexes for JSONB containment filters
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_agents_capabilities_gin
+    ON agents USING gin (capabilities jsonb_path_ops);
+
+-- Analytics filters/groupings on calls with denormalized agent_type
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_calls_status_agent_type_call_type
+    ON calls (status, agent_type, call_type);
+
+-- find_by_status: WHERE status = ? ORDER BY created_at DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_calls_status_created_at
+    ON calls (status, created_at DESC);
+
+-- find_completed_calls_by_types: completed calls, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_calls_status_call_type_completed_at
+    ON calls (status, call_type, completed_at DESC);
+
+-- Tenant-scoped dashboards: tenant filter + status + recency
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_calls_tenant_status_created_at
+    ON calls (tenant_id, status, created_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_calls_call_metadata_gin
+    ON calls USING gin (call_metadata jsonb_path_ops);
+
+-- Covers find_assignments_by_performance (index-only scan)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assignments_perf_covering
+    ON assignments (assignment_time_ms)
+    INCLUDE (id, call_id, agent_id, status)
+    WHERE assignment_time_ms IS NOT NULL;
+
+-- Active-assignment scans skip the terminal rows
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assignments_active
+    ON assignments (status)
+    WHERE status IN (0, 1);  -- PENDING, ACTIVE
+
+-- find_completed_assignments: keyset pages over completed rows
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assignments_completed_at_id
+    ON assignments (completed_at DESC, id DESC)
+    WHERE status = 2;  -- COMPLETED
+
+-- find_by_agent_id filter
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assignments_agent_id
+    ON assignments (agent_id);
+
+-- Tenant-scoped assignment listings
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assignments_tenant_status_created_at
+    ON assignments (tenant_id, status, created_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assignments_assignment_metadata_gin
+    ON assignments USING gin (assignment_metadata jsonb_path_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tenants_configuration_gin
+    ON tenants USING gin (configuration jsonb_path_ops);
+
+-- Tenant-scoped metric reads over a time window
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_system_metrics_tenant_recorded_at
+    ON system_metrics (tenant_id, recorded_at DESC);
+
 -- Functions for common operations
 -- Function to get agent idle time
 CREATE OR REPLACE FUNCTION get_agent_idle_time(agent_uuid UUID)
@@ -218,7 +322,7 @@ SELECT
     a.agent_type,
     a.tenant_id,
     COUNT(ass.id) as total_assignments,
-    COUNT(CASE WHEN ass.status = 'COMPLETED' THEN 1 END) as completed_assignments,
+    COUNT(CASE WHEN ass.status = 2 THEN 1 END) as completed_assignments,  -- COMPLETED
     AVG(ass.assignment_time_ms) as avg_assignment_time_ms,
     AVG(ass.actual_duration_seconds) as avg_call_duration_seconds,
     COUNT(CASE WHEN ass.assignment_time_ms <= 100 THEN 1 END)::FLOAT / 
@@ -233,8 +337,8 @@ SELECT
     c.tenant_id,
     c.call_type,
     COUNT(*) as total_calls,
-    COUNT(CASE WHEN c.status = 'COMPLETED' THEN 1 END) as completed_calls,
-    COUNT(CASE WHEN c.qualification_result = 'OK' THEN 1 END) as successful_calls,
+    COUNT(CASE WHEN c.status = 3 THEN 1 END) as completed_calls,  -- COMPLETED
+    COUNT(CASE WHEN c.qualification_result = 0 THEN 1 END) as successful_calls,  -- OK
     AVG(c.duration_seconds) as avg_duration_seconds,
     AVG(EXTRACT(EPOCH FROM (c.assigned_at - c.created_at))) as avg_wait_time_seconds
 FROM calls c
@@ -253,11 +357,11 @@ VALUES (
 CREATE MATERIALIZED VIEW IF NOT EXISTS dashboard_metrics AS
 SELECT 
     NOW() as snapshot_time,
-    COUNT(CASE WHEN a.status = 'AVAILABLE' THEN 1 END) as available_agents,
-    COUNT(CASE WHEN a.status = 'BUSY' THEN 1 END) as busy_agents,
-    COUNT(CASE WHEN c.status = 'PENDING' THEN 1 END) as pending_calls,
-    COUNT(CASE WHEN c.status = 'IN_PROGRESS' THEN 1 END) as active_calls,
-    COUNT(CASE WHEN ass.status = 'ACTIVE' THEN 1 END) as active_assignments
+    COUNT(CASE WHEN a.status = 0 THEN 1 END) as available_agents,   -- AVAILABLE
+    COUNT(CASE WHEN a.status = 1 THEN 1 END) as busy_agents,        -- BUSY
+    COUNT(CASE WHEN c.status = 0 THEN 1 END) as pending_calls,      -- PENDING
+    COUNT(CASE WHEN c.status = 2 THEN 1 END) as active_calls,       -- IN_PROGRESS
+    COUNT(CASE WHEN ass.status = 1 THEN 1 END) as active_assignments  -- ACTIVE
 FROM agents a
 CROSS JOIN calls c
 CROSS JOIN assignments ass
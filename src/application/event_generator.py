@@ -24,23 +24,19 @@ class EventGenerator:
         
     async def generate_test_agents(self, num_agents: int) -> List[Agent]:
         """Generate test agents with random distribution across agent types"""
-        agents = []
-        
-        for i in range(num_agents):
-            # Random distribution across agent types
-            agent_type = random.choice(settings.agent_types)
-            
-            agent = Agent(
+        agents = [
+            Agent(
                 name=f"Agent_{i+1:03d}",
-                agent_type=agent_type,
+                # Random distribution across agent types
+                agent_type=random.choice(settings.agent_types),
                 status=AgentStatus.AVAILABLE  # Start all agents as available
             )
-            
-            # Save agent to database
-            saved_agent = await self.agent_repository.save(agent)
-            agents.append(saved_agent)
-            
-            logger.info(f"Generated agent: {agent.name} ({agent.agent_type})")
+            for i in range(num_agents)
+        ]
+        
+        # One multi-row upsert instead of num_agents INSERT round-trips
+        agents = await self.agent_repository.save_many(agents)
+        logger.info(f"Generated {len(agents)} agents")
         
         self.generated_agents = agents
         return agents
@@ -1,5 +1,7 @@
 import asyncio
 import time
+
+import orjson
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
@@ -11,11 +13,17 @@ from domain.services.assignment_service import AssignmentService
 from domain.services.qualification_service import QualificationService
 from domain.repositories.agent_repository import AgentRepository
 from infrastructure.cache.redis_client import redis_client
+from infrastructure.database.metrics_writer import metrics_writer
 from infrastructure.api.webhook_client import WebhookClient
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# /status is polled by dashboards; a 1s shared cache turns every poll
+# within the window into a single Redis GET
+_STATUS_CACHE_KEY = "system:status"
+_STATUS_CACHE_TTL = 1
+
 class AssignmentResult:
     """Result of an assignment attempt"""
     
@@ -104,10 +112,12 @@ class CallOrchestrator:
                 # Store active assignment
                 self.active_assignments[call.id] = assignment
                 
-                # Update entities in Redis
-                await redis_client.set_call_status(call)
-                await redis_client.set_agent_status(selected_agent)
-                await redis_client.remove_pending_call(call.id)
+                # Update entities in Redis atomically (one round-trip);
+                # fall back to the individual writes if the script fails
+                if not await redis_client.atomic_assign(call, selected_agent):
+                    await redis_client.set_call_status(call)
+                    await redis_client.set_agent_status(selected_agent)
+                    await redis_client.remove_pending_call(call.id)
                 
                 # Schedule call completion
                 await self._schedule_call_completion(call, selected_agent, assignment, expected_duration)
@@ -118,6 +128,10 @@ class CallOrchestrator:
                 # Update metrics
                 await redis_client.increment_metric("calls_assigned")
                 await redis_client.set_metric("last_assignment_time_ms", assignment_time_ms)
+                metrics_writer.record(
+                    "assignment_time_ms", assignment_time_ms, "assignment",
+                    agent_type=selected_agent.agent_type, call_type=call.call_type
+                )
                 
                 logger.info(f"Call {call.id} assigned to agent {selected_agent.id} in {assignment_time_ms:.2f}ms")
                 
@@ -216,6 +230,10 @@ class CallOrchestrator:
             await redis_client.increment_metric("calls_completed")
             await redis_client.increment_metric(f"calls_{qualification.value.lower()}")
             await redis_client.set_metric("last_call_duration", actual_duration)
+            metrics_writer.record(
+                "call_duration_seconds", actual_duration, "qualification",
+                agent_type=agent.agent_type, call_type=call.call_type
+            )
             
             logger.info(f"Call {call_id} completed: {qualification.value}, duration: {actual_duration:.1f}s")
             
@@ -291,27 +309,43 @@ class CallOrchestrator:
             return False
     
     async def get_system_status(self) -> Dict:
-        """Get current system status"""
+        """Get current system status, served cache-aside with a short TTL"""
+        cached = await redis_client.cache_get(_STATUS_CACHE_KEY)
+        if cached:
+            return orjson.loads(cached)
+        
         try:
             # Get metrics from Redis
             metrics = await redis_client.get_all_metrics()
             
-            # Get agent counts
-            all_agents = await self.agent_repository.find_all()
-            available_agents = await self.agent_repository.find_available()
+            # O(1) counters maintained on every agent write; only scan
+            # the agents table when they are cold
+            status_counts = await redis_client.get_agent_status_counts()
             
-            agent_counts = {
-                "total": len(all_agents),
-                "available": len(available_agents),
-                "busy": len([a for a in all_agents if a.status == AgentStatus.BUSY]),
-                "paused": len([a for a in all_agents if a.status == AgentStatus.PAUSED]),
-                "offline": len([a for a in all_agents if a.status == AgentStatus.OFFLINE])
-            }
+            if status_counts:
+                agent_counts = {
+                    "total": sum(status_counts.values()),
+                    "available": status_counts.get(AgentStatus.AVAILABLE.value, 0),
+                    "busy": status_counts.get(AgentStatus.BUSY.value, 0),
+                    "paused": status_counts.get(AgentStatus.PAUSED.value, 0),
+                    "offline": status_counts.get(AgentStatus.OFFLINE.value, 0)
+                }
+            else:
+                all_agents = await self.agent_repository.find_all()
+                available_agents = await self.agent_repository.find_available()
+                
+                agent_counts = {
+                    "total": len(all_agents),
+                    "available": len(available_agents),
+                    "busy": len([a for a in all_agents if a.status == AgentStatus.BUSY]),
+                    "paused": len([a for a in all_agents if a.status == AgentStatus.PAUSED]),
+                    "offline": len([a for a in all_agents if a.status == AgentStatus.OFFLINE])
+                }
             
             # Active assignments
             active_count = len(self.active_assignments)
             
-            return {
+            status = {
                 "timestamp": datetime.utcnow().isoformat(),
                 "agents": agent_counts,
                 "active_assignments": active_count,
@@ -322,6 +356,12 @@ class CallOrchestrator:
                 }
             }
             
+            await redis_client.cache_set(
+                _STATUS_CACHE_KEY, orjson.dumps(status).decode(), _STATUS_CACHE_TTL
+            )
+            
+            return status
+            
         except Exception as e:
             logger.error(f"Error getting system status: {str(e)}")
             return {"error": str(e)}
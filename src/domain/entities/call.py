@@ -24,7 +24,9 @@ class Call:
     call_type: str = ""
     status: CallStatus = CallStatus.PENDING
     assigned_agent_id: Optional[str] = None
+    agent_type: Optional[str] = None  # Denormalized from the assigned agent
     qualification_result: QualificationResult = QualificationResult.PENDING
+    priority: int = 0
     created_at: datetime = field(default_factory=datetime.utcnow)
     assigned_at: Optional[datetime] = None
     started_at: Optional[datetime] = None
@@ -83,7 +85,9 @@ class Call:
             "call_type": self.call_type,
             "status": self.status.value,
             "assigned_agent_id": self.assigned_agent_id,
+            "agent_type": self.agent_type,
             "qualification_result": self.qualification_result.value,
+            "priority": self.priority,
             "created_at": self.created_at.isoformat(),
             "assigned_at": self.assigned_at.isoformat() if self.assigned_at else None,
             "started_at": self.started_at.isoformat() if self.started_at else None,
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 import uuid
@@ -137,6 +138,46 @@ class AgentRepository(AgentRepositoryInterface):
                 print(f"Save agent error: {e}")
                 raise e
     
+    async def save_many(self, agents: List[Agent]) -> List[Agent]:
+        """Save a batch of agents with one multi-row upsert round-trip"""
+        if not agents:
+            return []
+
+        rows = []
+        for agent in agents:
+            if agent.id:
+                try:
+                    agent_uuid = uuid.UUID(agent.id) if isinstance(agent.id, str) else agent.id
+                except ValueError:
+                    agent_uuid = uuid.uuid4()
+            else:
+                agent_uuid = uuid.uuid4()
+            agent.id = str(agent_uuid)
+
+            rows.append({
+                "id": agent_uuid,
+                "name": agent.name or "",
+                "agent_type": agent.agent_type or "",
+                "status": agent.status or AgentStatus.OFFLINE,
+                "last_call_end_time": agent.last_call_end_time,
+                "current_call_id": uuid.UUID(agent.current_call_id) if agent.current_call_id else None,
+                "created_at": agent.created_at or datetime.utcnow(),
+                "updated_at": agent.updated_at or datetime.utcnow()
+            })
+
+        async with db_connection.get_session() as session:
+            stmt = pg_insert(AgentModel).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[AgentModel.id],
+                set_={key: stmt.excluded[key] for key in rows[0] if key != "id"}
+            )
+            await session.execute(stmt)
+
+        # One pipelined Redis pass for the whole batch
+        await redis_client.set_agent_statuses(agents)
+
+        return agents
+
     async def find_by_id(self, agent_id: str) -> Optional[Agent]:
         """Find agent by ID"""
         if not agent_id:
@@ -159,7 +200,7 @@ class AgentRepository(AgentRepositoryInterface):
             print(f"Redis lookup failed: {redis_error}")
         
         # Fallback to database
-        async with db_connection.get_session() as session:
+        async with db_connection.get_read_session() as session:
             try:
                 agent_uuid = uuid.UUID(agent_id) if isinstance(agent_id, str) else agent_id
                 stmt = select(AgentModel).where(AgentModel.id == agent_uuid)
@@ -179,7 +220,7 @@ class AgentRepository(AgentRepositoryInterface):
     
     async def find_all(self) -> List[Agent]:
         """Find all agents"""
-        async with db_connection.get_session() as session:
+        async with db_connection.get_read_session() as session:
             try:
                 stmt = select(AgentModel).order_by(AgentModel.created_at)
                 result = await session.execute(stmt)
@@ -196,6 +237,51 @@ class AgentRepository(AgentRepositoryInterface):
                 print(f"Find all agents failed: {e}")
                 return []
     
+    async def find_all_as_json(self) -> Optional[bytes]:
+        """Fetch all agents as a JSON array serialized by Postgres
+
+        jsonb_agg/jsonb_build_object build the array server-side, so the
+        read path skips per-row ORM hydration, entity conversion and
+        re-serialization entirely. The object lists exactly the
+        AgentResponse fields (this path bypasses the Pydantic filter), with
+        the SMALLINT status code translated back to its label and
+        idle_time_seconds computed in SQL to match Agent.to_dict. Returns
+        None on failure so callers can fall back to find_all.
+        """
+        async with db_connection.get_read_session() as session:
+            try:
+                result = await session.execute(text(
+                    """SELECT COALESCE(
+                           jsonb_agg(
+                               jsonb_build_object(
+                                   'id', id,
+                                   'name', name,
+                                   'agent_type', agent_type,
+                                   'status',
+                                   CASE status
+                                       WHEN 0 THEN 'AVAILABLE'
+                                       WHEN 1 THEN 'BUSY'
+                                       WHEN 2 THEN 'PAUSED'
+                                       WHEN 3 THEN 'OFFLINE'
+                                   END,
+                                   'last_call_end_time', last_call_end_time,
+                                   'current_call_id', current_call_id,
+                                   'created_at', created_at,
+                                   'updated_at', updated_at,
+                                   'idle_time_seconds',
+                                   EXTRACT(EPOCH FROM (NOW() - last_call_end_time))
+                               )
+                               ORDER BY created_at
+                           ),
+                           '[]'::jsonb
+                       )::text
+                       FROM agents"""
+                ))
+                return result.scalar_one().encode()
+            except Exception as e:
+                print(f"Find all agents as JSON failed: {e}")
+                return None
+    
     async def find_available(self) -> List[Agent]:
         """Find all available agents ordered by idle time (longest first)"""
         try:
@@ -214,7 +300,7 @@ class AgentRepository(AgentRepositoryInterface):
             print(f"Redis available agents lookup failed: {redis_error}")
         
         # Fallback to database
-        async with db_connection.get_session() as session:
+        async with db_connection.get_read_session() as session:
             try:
                 stmt = select(AgentModel).where(
                     AgentModel.status == AgentStatus.AVAILABLE
@@ -257,16 +343,53 @@ class AgentRepository(AgentRepositoryInterface):
     
     async def count_by_status(self, status: AgentStatus) -> int:
         """Count agents by status"""
-        async with db_connection.get_session() as session:
+        async with db_connection.get_read_session() as session:
             try:
-                stmt = select(AgentModel).where(AgentModel.status == status)
+                stmt = select(func.count()).select_from(AgentModel).where(
+                    AgentModel.status == status
+                )
                 result = await session.execute(stmt)
-                models = result.scalars().all()
-                return len(models)
+                return result.scalar_one()
             except Exception as e:
                 print(f"Count by status failed: {e}")
                 return 0
     
+    async def update_status_returning(self, agent_id: str, status: AgentStatus) -> Optional[Agent]:
+        """Update agent status and get the updated row in one round-trip"""
+        if not agent_id:
+            return None
+        
+        try:
+            agent_uuid = uuid.UUID(agent_id) if isinstance(agent_id, str) else agent_id
+        except ValueError:
+            return None
+        
+        async with db_connection.get_session() as session:
+            try:
+                stmt = update(AgentModel).where(
+                    AgentModel.id == agent_uuid
+                ).values(
+                    status=status,
+                    updated_at=datetime.utcnow()
+                ).returning(AgentModel)
+                
+                result = await session.execute(stmt)
+                model = result.scalar_one_or_none()
+                
+                if model is None:
+                    return None
+                
+                agent = self._model_to_entity(model)
+                
+                # Update Redis cache
+                await redis_client.set_agent_status(agent)
+                
+                return agent
+            except Exception as e:
+                await session.rollback()
+                print(f"Update status returning failed: {e}")
+                return None
+    
     async def update_status(self, agent_id: str, status: AgentStatus) -> bool:
         """Update agent status"""
         try:
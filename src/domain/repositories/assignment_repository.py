@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
-from sqlalchemy import select, update, delete, and_
+from typing import AsyncIterator, List, Optional, Tuple, Dict, Any
+from sqlalchemy import select, update, delete, and_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 
@@ -8,6 +8,23 @@ from domain.entities.assignment import Assignment, AssignmentStatus
 from infrastructure.database.models import AssignmentModel
 from infrastructure.database.connection import db_connection
 
+# Cached value -> member map; a dict lookup is cheaper than Enum.__call__
+# when hydrating large result sets row by row. Keyed by both the raw value
+# and the member itself since the Enum column may return either.
+_STATUS_MAP = {s.value: s for s in AssignmentStatus}
+_STATUS_MAP.update({s: s for s in AssignmentStatus})
+
+def start_of_day(dt: datetime) -> datetime:
+    """
+    Truncate a datetime to its day boundary on the parameter side.
+
+    Date filters must stay plain `column >= :ts` comparisons so PostgreSQL
+    can use the completed_at index; wrapping the column in date_trunc()
+    in SQL would force a sequential scan. Callers that need daily buckets
+    should truncate here, in Python, before passing the bound.
+    """
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
 class AssignmentRepositoryInterface(ABC):
     """Abstract interface for assignment repository"""
     
@@ -22,8 +39,8 @@ class AssignmentRepositoryInterface(ABC):
         pass
     
     @abstractmethod
-    async def find_all(self) -> List[Assignment]:
-        """Find all assignments"""
+    def find_all(self) -> AsyncIterator[Assignment]:
+        """Stream all assignments"""
         pass
     
     @abstractmethod
@@ -32,10 +49,18 @@ class AssignmentRepositoryInterface(ABC):
         pass
     
     @abstractmethod
-    async def find_by_agent_id(self, agent_id: str) -> List[Assignment]:
-        """Find assignments by agent ID"""
+    def find_by_agent_id(self, agent_id: str) -> AsyncIterator[Assignment]:
+        """Stream assignments by agent ID"""
         pass
     
+    @abstractmethod
+    async def find_completed_assignments(self, start_date: Optional[datetime] = None,
+                                         end_date: Optional[datetime] = None,
+                                         cursor: Optional[Tuple[datetime, Any]] = None,
+                                         limit: int = 500) -> Tuple[List[Assignment], Optional[Tuple[datetime, Any]]]:
+        """Find completed assignments in a date range, keyset-paginated"""
+        pass
+
     @abstractmethod
     async def delete(self, assignment_id: str) -> bool:
         """Delete assignment"""
@@ -47,13 +72,14 @@ class AssignmentRepository(AssignmentRepositoryInterface):
     def __init__(self):
         pass
     
-    def _model_to_entity(self, model: AssignmentModel) -> Assignment:
+    @staticmethod
+    def _model_to_entity(model: AssignmentModel) -> Assignment:
         """Convert database model to domain entity"""
         return Assignment(
             id=model.id,
             call_id=model.call_id,
             agent_id=model.agent_id,
-            status=AssignmentStatus(model.status),
+            status=_STATUS_MAP[model.status],
             assignment_time_ms=model.assignment_time_ms,
             expected_duration_seconds=model.expected_duration_seconds,
             actual_duration_seconds=model.actual_duration_seconds,
@@ -62,31 +88,38 @@ class AssignmentRepository(AssignmentRepositoryInterface):
             completed_at=model.completed_at
         )
     
+    @staticmethod
+    def _entity_to_values(assignment: Assignment) -> Dict[str, Any]:
+        """Serialize domain entity to a column -> value dict in one expression"""
+        return {
+            "id": assignment.id,
+            "call_id": assignment.call_id,
+            "agent_id": assignment.agent_id,
+            "status": assignment.status.value,
+            "assignment_time_ms": assignment.assignment_time_ms,
+            "expected_duration_seconds": assignment.expected_duration_seconds,
+            "actual_duration_seconds": assignment.actual_duration_seconds,
+            "created_at": assignment.created_at,
+            "activated_at": assignment.activated_at,
+            "completed_at": assignment.completed_at
+        }
+
     def _entity_to_model(self, assignment: Assignment, model: Optional[AssignmentModel] = None) -> AssignmentModel:
         """Convert domain entity to database model"""
         if model is None:
             model = AssignmentModel()
-        
-        model.id = assignment.id
-        model.call_id = assignment.call_id
-        model.agent_id = assignment.agent_id
-        model.status = assignment.status.value
-        model.assignment_time_ms = assignment.assignment_time_ms
-        model.expected_duration_seconds = assignment.expected_duration_seconds
-        model.actual_duration_seconds = assignment.actual_duration_seconds
-        model.created_at = assignment.created_at
-        model.activated_at = assignment.activated_at
-        model.completed_at = assignment.completed_at
-        
+
+        for key, value in self._entity_to_values(assignment).items():
+            setattr(model, key, value)
+
         return model
     
     async def save(self, assignment: Assignment) -> Assignment:
         """Save or update an assignment"""
         async with db_connection.get_session() as session:
-            # Check if assignment exists
-            stmt = select(AssignmentModel).where(AssignmentModel.id == assignment.id)
-            result = await session.execute(stmt)
-            existing_model = result.scalar_one_or_none()
+            # PK fast-path: hits the identity map and skips Core
+            # statement construction for the existence check
+            existing_model = await session.get(AssignmentModel, assignment.id)
             
             if existing_model:
                 # Update existing
@@ -102,28 +135,29 @@ class AssignmentRepository(AssignmentRepositoryInterface):
     
     async def find_by_id(self, assignment_id: str) -> Optional[Assignment]:
         """Find assignment by ID"""
-        async with db_connection.get_session() as session:
-            stmt = select(AssignmentModel).where(AssignmentModel.id == assignment_id)
-            result = await session.execute(stmt)
-            model = result.scalar_one_or_none()
+        async with db_connection.get_read_session() as session:
+            model = await session.get(AssignmentModel, assignment_id)
             
             if model:
                 return self._model_to_entity(model)
             
             return None
     
-    async def find_all(self) -> List[Assignment]:
-        """Find all assignments"""
-        async with db_connection.get_session() as session:
+    async def find_all(self) -> AsyncIterator[Assignment]:
+        """
+        Stream all assignments without materializing the full table
+
+        Callers that need a list can wrap with `[a async for a in repo.find_all()]`.
+        """
+        async with db_connection.get_read_session() as session:
             stmt = select(AssignmentModel).order_by(AssignmentModel.created_at.desc())
-            result = await session.execute(stmt)
-            models = result.scalars().all()
-            
-            return [self._model_to_entity(model) for model in models]
+            to_entity = self._model_to_entity
+            async for model in await session.stream_scalars(stmt):
+                yield to_entity(model)
     
     async def find_by_call_id(self, call_id: str) -> Optional[Assignment]:
         """Find assignment by call ID"""
-        async with db_connection.get_session() as session:
+        async with db_connection.get_read_session() as session:
             stmt = select(AssignmentModel).where(AssignmentModel.call_id == call_id)
             result = await session.execute(stmt)
             model = result.scalar_one_or_none()
@@ -133,22 +167,118 @@ class AssignmentRepository(AssignmentRepositoryInterface):
             
             return None
     
-    async def find_by_agent_id(self, agent_id: str) -> List[Assignment]:
-        """Find assignments by agent ID"""
-        async with db_connection.get_session() as session:
+    async def find_by_agent_id(self, agent_id: str) -> AsyncIterator[Assignment]:
+        """Stream assignments by agent ID"""
+        async with db_connection.get_read_session() as session:
             stmt = select(AssignmentModel).where(
                 AssignmentModel.agent_id == agent_id
             ).order_by(AssignmentModel.created_at.desc())
-            
+
+            to_entity = self._model_to_entity
+            async for model in await session.stream_scalars(stmt):
+                yield to_entity(model)
+    
+    async def find_completed_assignments(self, start_date: Optional[datetime] = None,
+                                         end_date: Optional[datetime] = None,
+                                         cursor: Optional[Tuple[datetime, Any]] = None,
+                                         limit: int = 500) -> Tuple[List[Assignment], Optional[Tuple[datetime, Any]]]:
+        """
+        Find completed assignments in a date range using keyset pagination
+
+        Bounds are compared directly against completed_at so the index stays
+        usable; truncate to day boundaries with start_of_day() before calling
+        instead of expecting SQL-side date_trunc. Ordering and the cursor
+        both use the (completed_at, id) pair: completed_at alone is not
+        unique, and a cursor on it would skip rows sharing the boundary
+        timestamp across a page break.
+
+        Args:
+            start_date: Inclusive lower bound on completed_at
+            end_date: Inclusive upper bound on completed_at
+            cursor: Exclusive (completed_at, id) bound from a previous page's last row
+            limit: Maximum rows per page
+
+        Returns:
+            tuple: (assignments, next_cursor) where next_cursor is None on the last page
+        """
+        async with db_connection.get_read_session() as session:
+            stmt = select(AssignmentModel).where(
+                AssignmentModel.status == AssignmentStatus.COMPLETED.value
+            )
+
+            if start_date:
+                stmt = stmt.where(AssignmentModel.completed_at >= start_date)
+            if end_date:
+                stmt = stmt.where(AssignmentModel.completed_at <= end_date)
+            if cursor:
+                # Row-value comparison matching the DESC (completed_at, id)
+                # ordering: strictly after the previous page's last row
+                stmt = stmt.where(
+                    tuple_(AssignmentModel.completed_at, AssignmentModel.id) < cursor
+                )
+
+            stmt = stmt.order_by(
+                AssignmentModel.completed_at.desc(), AssignmentModel.id.desc()
+            ).limit(limit)
+
             result = await session.execute(stmt)
             models = result.scalars().all()
-            
-            return [self._model_to_entity(model) for model in models]
-    
+
+            to_entity = self._model_to_entity
+            assignments = [to_entity(model) for model in models]
+
+            next_cursor = (
+                (assignments[-1].completed_at, assignments[-1].id)
+                if len(assignments) == limit else None
+            )
+
+            return assignments, next_cursor
+
+    async def find_assignments_by_performance(self, min_time_ms: Optional[float] = None,
+                                              max_time_ms: Optional[float] = None,
+                                              limit: int = 500) -> List[Assignment]:
+        """
+        Find assignments in an assignment_time_ms range, fastest first
+
+        Projects only the columns covered by ix_assignments_perf_covering so
+        PostgreSQL can satisfy the query with an index-only scan. Fields not
+        covered by the index are left at their defaults on the entities.
+        """
+        async with db_connection.get_read_session() as session:
+            stmt = select(
+                AssignmentModel.id,
+                AssignmentModel.call_id,
+                AssignmentModel.agent_id,
+                AssignmentModel.status,
+                AssignmentModel.assignment_time_ms
+            ).where(AssignmentModel.assignment_time_ms.is_not(None))
+
+            if min_time_ms is not None:
+                stmt = stmt.where(AssignmentModel.assignment_time_ms >= min_time_ms)
+            if max_time_ms is not None:
+                stmt = stmt.where(AssignmentModel.assignment_time_ms <= max_time_ms)
+
+            stmt = stmt.order_by(AssignmentModel.assignment_time_ms.asc()).limit(limit)
+
+            result = await session.execute(stmt)
+
+            return [
+                Assignment(
+                    id=row.id,
+                    call_id=row.call_id,
+                    agent_id=row.agent_id,
+                    status=_STATUS_MAP[row.status],
+                    assignment_time_ms=row.assignment_time_ms
+                )
+                for row in result
+            ]
+
     async def delete(self, assignment_id: str) -> bool:
         """Delete assignment"""
         async with db_connection.get_session() as session:
-            stmt = delete(AssignmentModel).where(AssignmentModel.id == assignment_id)
+            stmt = delete(AssignmentModel).where(
+                AssignmentModel.id == assignment_id
+            ).returning(AssignmentModel.id)
             result = await session.execute(stmt)
-            
-            return result.rowcount > 0
\ No newline at end of file
+
+            return result.scalar_one_or_none() is not None
\ No newline at end of file
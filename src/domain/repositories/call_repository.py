@@ -1,14 +1,51 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from sqlalchemy import select, update, delete
+
+import orjson
+from typing import Dict, List, Optional
+from sqlalchemy import select, update, delete, func, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
+from datetime import datetime, timezone
 
 from domain.entities.call import Call, CallStatus, QualificationResult
-from infrastructure.database.models import CallModel
+from infrastructure.database.models import AgentModel, CallModel
 from infrastructure.database.connection import db_connection
 from infrastructure.cache.redis_client import redis_client
 
+# Statements for the hottest lookups are built once at import time;
+# lambda_stmt caches the Core expression tree so per-call construction
+# cost is a dict lookup instead of rebuilding the select
+_SELECT_CALLS_BY_STATUS = lambda_stmt(
+    lambda: select(CallModel).where(
+        CallModel.status == bindparam("status")
+    ).order_by(CallModel.created_at.desc())
+)
+
+# Enum coercion caches: a dict hit is a single C-level hash lookup vs an
+# Enum.__call__ frame per row. Keyed by value string and by member, since
+# native Enum columns hand members back
+_STATUS_MAP = {status.value: status for status in CallStatus}
+_STATUS_MAP.update({status: status for status in CallStatus})
+_QUAL_MAP = {qualification.value: qualification for qualification in QualificationResult}
+_QUAL_MAP.update({qualification: qualification for qualification in QualificationResult})
+
+# Short-lived cache keys for the polled by-status reads; a couple of
+# seconds is enough to absorb dashboard polling without staleness issues
+_BY_STATUS_CACHE_TTL = 2
+
+# Server-side cursor window for unbounded result sets. asyncpg's cursor
+# prefetch defaults to 50 rows per round-trip; 500 collapses the
+# round-trip count 10x on multi-thousand-row exports while capping the
+# rows buffered in memory at once.
+_STREAM_WINDOW = 500
+_BY_STATUS_CACHE_KEYS = tuple(
+    key
+    for status in CallStatus
+    for key in (f"calls:by_status:{status.value}", f"calls:count:{status.value}")
+)
+
 class CallRepositoryInterface(ABC):
     """Abstract interface for call repository"""
     
@@ -23,8 +60,8 @@ class CallRepositoryInterface(ABC):
         pass
     
     @abstractmethod
-    async def find_all(self) -> List[Call]:
-        """Find all calls"""
+    async def find_all(self, limit: int = 1000, offset: int = 0) -> List[Call]:
+        """Find calls, newest first, bounded by limit/offset"""
         pass
     
     @abstractmethod
@@ -32,6 +69,11 @@ class CallRepositoryInterface(ABC):
         """Find calls by status"""
         pass
     
+    @abstractmethod
+    async def get_qualification_counts(self) -> List[tuple]:
+        """Get qualification counts per (agent_type, call_type) combination"""
+        pass
+
     @abstractmethod
     async def delete(self, call_id: str) -> bool:
         """Delete call"""
@@ -40,8 +82,11 @@ class CallRepositoryInterface(ABC):
 class CallRepository(CallRepositoryInterface):
     """PostgreSQL + Redis implementation of call repository"""
     
-    def __init__(self):
-        pass
+    def __init__(self, speculative_reads: bool = False):
+        # When enabled, find_by_id races Redis and Postgres instead of
+        # falling back serially — wasted DB work on cache hits, but cold
+        # reads stop paying Redis RTT + DB RTT back to back
+        self.speculative_reads = speculative_reads
     
     def _model_to_entity(self, model: CallModel) -> Call:
         """Convert database model to domain entity"""
@@ -49,9 +94,11 @@ class CallRepository(CallRepositoryInterface):
             id=model.id,
             phone_number=model.phone_number,
             call_type=model.call_type,
-            status=CallStatus(model.status),
+            status=_STATUS_MAP[model.status],
             assigned_agent_id=model.assigned_agent_id,
-            qualification_result=QualificationResult(model.qualification_result),
+            agent_type=model.agent_type,
+            qualification_result=_QUAL_MAP[model.qualification_result],
+            priority=model.priority or 0,
             created_at=model.created_at,
             assigned_at=model.assigned_at,
             started_at=model.started_at,
@@ -59,70 +106,114 @@ class CallRepository(CallRepositoryInterface):
             duration_seconds=model.duration_seconds
         )
     
+    @staticmethod
+    def _redis_data_to_entity(redis_data: dict) -> Call:
+        """Convert a cached Redis hash to a domain entity"""
+        return Call(
+            id=redis_data["id"],
+            phone_number=redis_data["phone_number"],
+            call_type=redis_data["call_type"],
+            status=_STATUS_MAP[redis_data["status"]],
+            assigned_agent_id=redis_data["assigned_agent_id"] if redis_data["assigned_agent_id"] else None,
+            agent_type=redis_data.get("agent_type") or None,
+            qualification_result=_QUAL_MAP[redis_data["qualification_result"]],
+            priority=int(redis_data.get("priority") or 0),
+            created_at=datetime.fromisoformat(redis_data["created_at"]),
+            assigned_at=datetime.fromisoformat(redis_data["assigned_at"]) if redis_data["assigned_at"] else None,
+            completed_at=datetime.fromisoformat(redis_data["completed_at"]) if redis_data["completed_at"] else None
+        )
+
+    @staticmethod
+    def _entity_to_values(call: Call) -> dict:
+        """Serialize domain entity to a column -> value dict in one expression"""
+        return {
+            "id": call.id,
+            "phone_number": call.phone_number,
+            "call_type": call.call_type,
+            "status": call.status.value,
+            "assigned_agent_id": call.assigned_agent_id,
+            "agent_type": call.agent_type,
+            "qualification_result": call.qualification_result.value,
+            "priority": call.priority,
+            "created_at": call.created_at,
+            "assigned_at": call.assigned_at,
+            "started_at": call.started_at,
+            "completed_at": call.completed_at,
+            "duration_seconds": call.duration_seconds
+        }
+
     def _entity_to_model(self, call: Call, model: Optional[CallModel] = None) -> CallModel:
         """Convert domain entity to database model"""
         if model is None:
             model = CallModel()
-        
-        model.id = call.id
-        model.phone_number = call.phone_number
-        model.call_type = call.call_type
-        model.status = call.status.value
-        model.assigned_agent_id = call.assigned_agent_id
-        model.qualification_result = call.qualification_result.value
-        model.created_at = call.created_at
-        model.assigned_at = call.assigned_at
-        model.started_at = call.started_at
-        model.completed_at = call.completed_at
-        model.duration_seconds = call.duration_seconds
-        
+
+        for key, value in self._entity_to_values(call).items():
+            setattr(model, key, value)
+
         return model
     
     async def save(self, call: Call) -> Call:
-        """Save or update a call"""
+        """Save or update a call with a single upsert round-trip"""
         async with db_connection.get_session() as session:
-            # Check if call exists
-            stmt = select(CallModel).where(CallModel.id == call.id)
-            result = await session.execute(stmt)
-            existing_model = result.scalar_one_or_none()
-            
-            if existing_model:
-                # Update existing
-                model = self._entity_to_model(call, existing_model)
-            else:
-                # Create new
-                model = self._entity_to_model(call)
-                session.add(model)
-            
-            await session.flush()
+            values = self._entity_to_values(call)
+
+            stmt = pg_insert(CallModel).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CallModel.id],
+                set_={key: stmt.excluded[key] for key in values if key != "id"}
+            )
+
+            await session.execute(stmt)
             
-            # Update Redis cache
+            # Update Redis cache and drop stale by-status entries
             await redis_client.set_call_status(call)
+            await redis_client.cache_delete(*_BY_STATUS_CACHE_KEYS)
             
-            return self._model_to_entity(model)
+            # The upsert writes every column from the entity and no server
+            # defaults fire, so the caller's entity is already current —
+            # skip hydrating a model just to rebuild an identical entity
+            return call
+
+    async def save_many(self, calls: List[Call]) -> List[Call]:
+        """Save a batch of calls with one multi-row upsert round-trip"""
+        if not calls:
+            return []
+
+        async with db_connection.get_session() as session:
+            rows = [self._entity_to_values(call) for call in calls]
+
+            stmt = pg_insert(CallModel).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CallModel.id],
+                set_={key: stmt.excluded[key] for key in rows[0] if key != "id"}
+            )
+
+            await session.execute(stmt)
+
+            # One pipelined Redis round-trip for the whole batch
+            await redis_client.set_call_statuses(calls)
+            await redis_client.cache_delete(*_BY_STATUS_CACHE_KEYS)
+
+            return calls
     
     async def find_by_id(self, call_id: str) -> Optional[Call]:
         """Find call by ID"""
+        if self.speculative_reads:
+            return await self._find_by_id_speculative(call_id)
+
         # Try Redis first for real-time data
         redis_data = await redis_client.get_call_status(call_id)
         if redis_data:
-            return Call(
-                id=redis_data["id"],
-                phone_number=redis_data["phone_number"],
-                call_type=redis_data["call_type"],
-                status=CallStatus(redis_data["status"]),
-                assigned_agent_id=redis_data["assigned_agent_id"] if redis_data["assigned_agent_id"] else None,
-                qualification_result=QualificationResult(redis_data["qualification_result"]),
-                created_at=datetime.fromisoformat(redis_data["created_at"]),
-                assigned_at=datetime.fromisoformat(redis_data["assigned_at"]) if redis_data["assigned_at"] else None,
-                completed_at=datetime.fromisoformat(redis_data["completed_at"]) if redis_data["completed_at"] else None
-            )
+            return self._redis_data_to_entity(redis_data)
         
-        # Fallback to database
-        async with db_connection.get_session() as session:
-            stmt = select(CallModel).where(CallModel.id == call_id)
-            result = await session.execute(stmt)
-            model = result.scalar_one_or_none()
+        return await self._db_find_by_id(call_id)
+
+    async def _db_find_by_id(self, call_id: str) -> Optional[Call]:
+        """Load a call from the database and warm the Redis cache"""
+        # session.get uses the PK fast-path and the identity map
+        # instead of building a SELECT statement
+        async with db_connection.get_read_session() as session:
+            model = await session.get(CallModel, call_id)
             
             if model:
                 call = self._model_to_entity(model)
@@ -131,47 +222,279 @@ class CallRepository(CallRepositoryInterface):
                 return call
             
             return None
+
+    async def _find_by_id_speculative(self, call_id: str) -> Optional[Call]:
+        """Race the Redis and database lookups to cut cold-read latency"""
+        redis_task = asyncio.create_task(redis_client.get_call_status(call_id))
+        db_task = asyncio.create_task(self._db_find_by_id(call_id))
+
+        done, _ = await asyncio.wait({redis_task, db_task}, return_when=asyncio.FIRST_COMPLETED)
+
+        if redis_task in done:
+            redis_data = redis_task.result()
+            if redis_data:
+                db_task.cancel()
+                return self._redis_data_to_entity(redis_data)
+            return await db_task
+
+        # Database answered first; its row is authoritative
+        redis_task.cancel()
+        return await db_task
     
-    async def find_all(self) -> List[Call]:
-        """Find all calls"""
-        async with db_connection.get_session() as session:
-            stmt = select(CallModel).order_by(CallModel.created_at.desc())
+    async def find_all(self, limit: int = 1000, offset: int = 0) -> List[Call]:
+        """
+        Find calls, newest first, bounded by limit/offset
+
+        Pagination is mandatory so a large calls table can never be
+        materialized wholesale; callers page through with offset.
+        """
+        async with db_connection.get_read_session() as session:
+            stmt = select(CallModel).order_by(
+                CallModel.created_at.desc()
+            ).limit(limit).offset(offset)
             result = await session.execute(stmt)
             models = result.scalars().all()
             
             calls = [self._model_to_entity(model) for model in models]
             
-            # Update Redis cache for recent calls
-            for call in calls[:100]:  # Cache only recent 100 calls
-                await redis_client.set_call_status(call)
+            # Update Redis cache for recent calls in one pipelined round-trip
+            await redis_client.set_call_statuses(calls[:100])  # Cache only recent 100 calls
             
             return calls
     
+    @staticmethod
+    def _entity_to_cache(call: Call) -> dict:
+        """Serialize an entity for the by-status cache.
+
+        Timestamps are stored as epoch floats so hydration avoids the
+        pure-Python isoformat parser on every cached read.
+        """
+        return {
+            "id": call.id,
+            "phone_number": call.phone_number,
+            "call_type": call.call_type,
+            "status": call.status.value,
+            "assigned_agent_id": call.assigned_agent_id,
+            "agent_type": call.agent_type,
+            "qualification_result": call.qualification_result.value,
+            "priority": call.priority,
+            "created_at": call.created_at.timestamp() if call.created_at else None,
+            "assigned_at": call.assigned_at.timestamp() if call.assigned_at else None,
+            "started_at": call.started_at.timestamp() if call.started_at else None,
+            "completed_at": call.completed_at.timestamp() if call.completed_at else None,
+            "duration_seconds": call.duration_seconds
+        }
+
+    @staticmethod
+    def _cache_to_entity(data: dict) -> Call:
+        """Hydrate an entity from the by-status cache"""
+        # Epochs were taken from timezone-aware datetimes; hydrate them
+        # back as UTC so cache hits and DB reads compare equal
+        def from_ts(ts):
+            return datetime.fromtimestamp(ts, tz=timezone.utc)
+        return Call(
+            id=data["id"],
+            phone_number=data["phone_number"],
+            call_type=data["call_type"],
+            status=_STATUS_MAP[data["status"]],
+            assigned_agent_id=data["assigned_agent_id"],
+            agent_type=data["agent_type"],
+            qualification_result=_QUAL_MAP[data["qualification_result"]],
+            priority=data.get("priority", 0),
+            created_at=from_ts(data["created_at"]) if data["created_at"] else None,
+            assigned_at=from_ts(data["assigned_at"]) if data["assigned_at"] else None,
+            started_at=from_ts(data["started_at"]) if data["started_at"] else None,
+            completed_at=from_ts(data["completed_at"]) if data["completed_at"] else None,
+            duration_seconds=data["duration_seconds"]
+        )
+
     async def find_by_status(self, status: CallStatus) -> List[Call]:
-        """Find calls by status"""
-        async with db_connection.get_session() as session:
-            stmt = select(CallModel).where(
-                CallModel.status == status.value
-            ).order_by(CallModel.created_at.desc())
-            
-            result = await session.execute(stmt)
+        """Find calls by status, served cache-aside with a short TTL"""
+        cache_key = f"calls:by_status:{status.value}"
+        cached = await redis_client.cache_get(cache_key)
+        if cached:
+            return [self._cache_to_entity(data) for data in orjson.loads(cached)]
+
+        async with db_connection.get_read_session() as session:
+            result = await session.execute(
+                _SELECT_CALLS_BY_STATUS, {"status": status.value}
+            )
             models = result.scalars().all()
             
             calls = [self._model_to_entity(model) for model in models]
             
-            # Update Redis cache
-            for call in calls:
-                await redis_client.set_call_status(call)
+            # Update Redis cache in one pipelined round-trip
+            await redis_client.set_call_statuses(calls)
+
+            await redis_client.cache_set(
+                cache_key,
+                orjson.dumps([self._entity_to_cache(call) for call in calls]).decode(),
+                _BY_STATUS_CACHE_TTL
+            )
             
             return calls
     
+    async def find_pending_calls(self, count: int = 10) -> List[Call]:
+        """
+        Find pending calls from the Redis queue in two round-trips
+
+        Fetches the queued ids, resolves cached statuses with one pipelined
+        batch, then loads any cache misses with a single IN query instead of
+        one lookup per call.
+        """
+        pending_call_ids = await redis_client.get_pending_calls(count)
+        if not pending_call_ids:
+            return []
+
+        cached = await redis_client.get_call_statuses(pending_call_ids)
+
+        calls_by_id = {
+            call_id: self._redis_data_to_entity(data)
+            for call_id, data in cached.items()
+        }
+
+        missing_ids = [call_id for call_id in pending_call_ids if call_id not in calls_by_id]
+
+        if missing_ids:
+            async with db_connection.get_read_session() as session:
+                stmt = select(CallModel).where(
+                    CallModel.id.in_(missing_ids),
+                    CallModel.status == CallStatus.PENDING.value
+                )
+                result = await session.execute(stmt)
+
+                for model in result.scalars().all():
+                    call = self._model_to_entity(model)
+                    calls_by_id[str(call.id)] = call
+
+        # Preserve queue order
+        return [calls_by_id[call_id] for call_id in pending_call_ids if call_id in calls_by_id]
+
+    async def find_completed_calls_by_types(self, agent_type: Optional[str] = None,
+                                            call_type: Optional[str] = None) -> List[Call]:
+        """
+        Find completed calls, optionally filtered by agent type and call type
+
+        The agent-type filter is applied through a JOIN on the assigned agent
+        so the database returns only matching rows; no per-call agent lookups
+        happen in Python.
+        """
+        async with db_connection.get_read_session() as session:
+            stmt = select(CallModel).where(CallModel.status == CallStatus.COMPLETED.value)
+
+            if agent_type:
+                stmt = stmt.join(
+                    AgentModel, AgentModel.id == CallModel.assigned_agent_id
+                ).where(AgentModel.agent_type == agent_type)
+            if call_type:
+                stmt = stmt.where(CallModel.call_type == call_type)
+
+            stmt = stmt.order_by(CallModel.completed_at.desc())
+
+            # Unbounded result set: stream it through a server-side
+            # cursor in _STREAM_WINDOW-row batches instead of buffering
+            # every row before the first entity is built
+            stream = await session.stream_scalars(
+                stmt.execution_options(yield_per=_STREAM_WINDOW)
+            )
+
+            to_entity = self._model_to_entity
+            return [to_entity(model) async for model in stream]
+
+    async def count_by_status(self, status: CallStatus) -> int:
+        """Count calls by status with a SQL COUNT, served cache-aside"""
+        cache_key = f"calls:count:{status.value}"
+        cached = await redis_client.cache_get(cache_key)
+        if cached is not None:
+            return int(cached)
+
+        async with db_connection.get_read_session() as session:
+            stmt = select(func.count()).select_from(CallModel).where(
+                CallModel.status == status.value
+            )
+            result = await session.execute(stmt)
+            count = result.scalar_one()
+
+        await redis_client.cache_set(cache_key, str(count), _BY_STATUS_CACHE_TTL)
+        return count
+
+    async def get_call_statistics(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get call counts grouped by status, call type and qualification result
+
+        Runs three GROUP BY queries so the database returns already-aggregated
+        pairs instead of every row being hydrated just to be counted.
+        """
+        async with db_connection.get_read_session() as session:
+            by_status = await session.execute(
+                select(CallModel.status, func.count()).group_by(CallModel.status)
+            )
+            by_call_type = await session.execute(
+                select(CallModel.call_type, func.count()).group_by(CallModel.call_type)
+            )
+            by_qualification = await session.execute(
+                select(CallModel.qualification_result, func.count()).group_by(
+                    CallModel.qualification_result
+                )
+            )
+
+            def as_counts(rows):
+                return {
+                    (value.value if hasattr(value, "value") else value): count
+                    for value, count in rows
+                }
+
+            return {
+                "by_status": as_counts(by_status),
+                "by_call_type": as_counts(by_call_type),
+                "by_qualification_result": as_counts(by_qualification)
+            }
+
+    async def get_qualification_counts(self) -> List[tuple]:
+        """
+        Get qualification counts per (agent_type, call_type) combination
+
+        Uses the denormalized agent_type on calls so the whole join+group
+        runs in the database and only aggregated rows come back.
+        """
+        async with db_connection.get_read_session() as session:
+            stmt = (
+                select(
+                    CallModel.agent_type,
+                    CallModel.call_type,
+                    CallModel.qualification_result,
+                    func.count()
+                )
+                .where(
+                    CallModel.status == CallStatus.COMPLETED.value,
+                    CallModel.agent_type.is_not(None)
+                )
+                .group_by(
+                    CallModel.agent_type,
+                    CallModel.call_type,
+                    CallModel.qualification_result
+                )
+            )
+            result = await session.execute(stmt)
+
+            return [
+                (
+                    agent_type,
+                    call_type,
+                    qualification.value if hasattr(qualification, "value") else qualification,
+                    count
+                )
+                for agent_type, call_type, qualification, count in result.all()
+            ]
+
     async def delete(self, call_id: str) -> bool:
         """Delete call"""
         async with db_connection.get_session() as session:
             stmt = delete(CallModel).where(CallModel.id == call_id)
             result = await session.execute(stmt)
             
-            # Remove from Redis
+            # Remove from Redis and drop stale by-status entries
             await redis_client.remove_pending_call(call_id)
+            await redis_client.cache_delete(*_BY_STATUS_CACHE_KEYS)
             
             return result.rowcount > 0
\ No newline at end of file
@@ -1,11 +1,22 @@
+import heapq
+import time
 from typing import List, Optional
 from datetime import datetime
-import time
+
+import numpy as np
 
 from domain.entities.agent import Agent, AgentStatus
 from domain.entities.call import Call, CallStatus
 from domain.entities.assignment import Assignment, AssignmentStatus
 
+# Batch size above which get_assignment_metrics switches from the Python
+# loop to vectorized NumPy reductions
+_METRICS_VECTORIZE_THRESHOLD = 10_000
+
+# Pool size above which select_agent switches to the NumPy argmin path;
+# below this the plain generator pass wins on constant factors
+_SELECT_VECTORIZE_THRESHOLD = 64
+
 class AssignmentStrategy:
     """Strategy interface for agent assignment"""
     
@@ -20,21 +31,108 @@ class LongestIdleTimeStrategy(AssignmentStrategy):
         """Select agent with longest idle time"""
         if not available_agents:
             return None
-        
-        # Filter only available agents
-        truly_available = [agent for agent in available_agents if agent.is_available()]
-        
-        if not truly_available:
+
+        if len(available_agents) >= _SELECT_VECTORIZE_THRESHOLD:
+            return self._select_agent_vectorized(available_agents)
+
+        # Single O(N) pass: filter lazily and track the longest-idle agent
+        # without sorting or building an intermediate list
+        candidates = (agent for agent in available_agents if agent.is_available())
+
+        try:
+            return max(candidates, key=lambda agent: agent.get_idle_time_seconds())
+        except ValueError:
+            # No truly available agents
             return None
-        
-        # Sort by idle time (longest first)
-        sorted_agents = sorted(
-            truly_available,
-            key=lambda agent: agent.get_idle_time_seconds(),
-            reverse=True
+
+    @staticmethod
+    def _select_agent_vectorized(agents: List[Agent]) -> Optional[Agent]:
+        """argmin over a struct-of-arrays view of the pool
+
+        Longest idle == smallest last_call_end_time, so the per-agent
+        datetime subtraction in get_idle_time_seconds is unnecessary:
+        one epoch-seconds array (-inf = never called, i.e. maximal
+        idle), unavailable agents masked to +inf, one C-loop argmin.
+        """
+        n = len(agents)
+        last_end = np.fromiter(
+            (
+                agent.last_call_end_time.timestamp()
+                if agent.last_call_end_time else -np.inf
+                for agent in agents
+            ),
+            dtype=np.float64,
+            count=n
         )
-        
-        return sorted_agents[0]
+        unavailable = np.fromiter(
+            (not agent.is_available() for agent in agents), dtype=bool, count=n
+        )
+        last_end[unavailable] = np.inf
+
+        idx = int(np.argmin(last_end))
+        if last_end[idx] == np.inf:
+            # No truly available agents
+            return None
+        return agents[idx]
+
+class HeapIdleTimeStrategy(AssignmentStrategy):
+    """Longest-idle selection from an incrementally maintained min-heap
+
+    Opt-in alternative to LongestIdleTimeStrategy for very large pools:
+    agents are pushed keyed by last_call_end_time epoch (-inf = never
+    called) and the heap top is validated lazily against the current
+    pool, so stale entries are discarded on pop instead of being
+    searched for. Selection is O(log N) amortized in heap operations;
+    the per-call pool indexing is a dict build, not a comparison scan.
+    """
+
+    def __init__(self):
+        self._heap: list = []  # (last_call_end_time epoch, agent_id)
+        self._pushed: dict = {}  # agent_id -> epoch currently in the heap
+
+    @staticmethod
+    def _epoch(agent: Agent) -> float:
+        # Never called sorts first: maximal idle time
+        if agent.last_call_end_time is None:
+            return float("-inf")
+        return agent.last_call_end_time.timestamp()
+
+    def select_agent(self, available_agents: List[Agent], call: Call) -> Optional[Agent]:
+        """Select agent with longest idle time via the heap top"""
+        if not available_agents:
+            return None
+
+        pool = {agent.id: agent for agent in available_agents}
+
+        # Push agents whose key changed since their last push; the old
+        # entry stays behind as garbage and is lazily deleted below
+        for agent in available_agents:
+            epoch = self._epoch(agent)
+            if self._pushed.get(agent.id) != epoch:
+                heapq.heappush(self._heap, (epoch, agent.id))
+                self._pushed[agent.id] = epoch
+
+        while self._heap:
+            epoch, agent_id = self._heap[0]
+            agent = pool.get(agent_id)
+            if agent is None:
+                # Left the pool; forget it so a later reappearance re-pushes
+                heapq.heappop(self._heap)
+                self._pushed.pop(agent_id, None)
+                continue
+            if self._pushed.get(agent_id) != epoch:
+                # Stale duplicate; the current entry is elsewhere in the heap
+                heapq.heappop(self._heap)
+                continue
+            if not agent.is_available():
+                # Not assignable right now: drop its current entry and
+                # forget it so becoming available again re-pushes it
+                heapq.heappop(self._heap)
+                self._pushed.pop(agent_id, None)
+                continue
+            return agent
+
+        return None
 
 class AssignmentService:
     """Domain service for call assignment logic"""
@@ -49,19 +147,22 @@ class AssignmentService:
         Returns:
             tuple: (Assignment or None, Selected Agent or None, assignment_time_ms)
         """
-        start_time = time.time()
+        # Monotonic integer clock: immune to wall-clock adjustments and
+        # cheaper than time.time() on this sub-100ms SLA path
+        start_ns = time.perf_counter_ns()
+
+        def elapsed_ms() -> float:
+            return (time.perf_counter_ns() - start_ns) / 1_000_000
         
         # Validate call can be assigned
         if call.status != CallStatus.PENDING:
-            assignment_time_ms = (time.time() - start_time) * 1000
-            return None, None, assignment_time_ms
+            return None, None, elapsed_ms()
         
         # Select agent using strategy
         selected_agent = self.strategy.select_agent(available_agents, call)
         
         if selected_agent is None:
-            assignment_time_ms = (time.time() - start_time) * 1000
-            return None, None, assignment_time_ms
+            return None, None, elapsed_ms()
         
         # Create assignment
         assignment = Assignment(
@@ -72,17 +173,17 @@ class AssignmentService:
         # Update entities
         try:
             call.assign_to_agent(selected_agent.id)
+            call.agent_type = selected_agent.agent_type  # Denormalized for analytics queries
             selected_agent.assign_call(call.id)
             
-            assignment_time_ms = (time.time() - start_time) * 1000
+            assignment_time_ms = elapsed_ms()
             assignment.activate(assignment_time_ms, expected_duration_seconds=0)  # Will be set later
             
             return assignment, selected_agent, assignment_time_ms
             
         except ValueError as e:
             # Race condition or invalid state
-            assignment_time_ms = (time.time() - start_time) * 1000
-            return None, None, assignment_time_ms
+            return None, None, elapsed_ms()
     
     def validate_assignment_performance(self, assignment_time_ms: float, max_time_ms: float = 100) -> bool:
         """Validate that assignment meets performance requirements"""
@@ -100,9 +201,31 @@ class AssignmentService:
                 "performance_compliance_rate": 0
             }
         
-        assignment_times = [a.assignment_time_ms for a in assignments if a.assignment_time_ms is not None]
+        if len(assignments) >= _METRICS_VECTORIZE_THRESHOLD:
+            return self._get_assignment_metrics_vectorized(assignments)
         
-        if not assignment_times:
+        # Single pass with running counters instead of separate
+        # sum/max/min/filter reductions over an intermediate list
+        count = 0
+        total = 0.0
+        min_time = float('inf')
+        max_time = float('-inf')
+        under_100ms = 0
+        
+        for assignment in assignments:
+            time_ms = assignment.assignment_time_ms
+            if time_ms is None:
+                continue
+            count += 1
+            total += time_ms
+            if time_ms < min_time:
+                min_time = time_ms
+            if time_ms > max_time:
+                max_time = time_ms
+            if time_ms <= 100:
+                under_100ms += 1
+        
+        if count == 0:
             return {
                 "total_assignments": len(assignments),
                 "avg_assignment_time_ms": 0,
@@ -112,13 +235,61 @@ class AssignmentService:
                 "performance_compliance_rate": 0
             }
         
-        under_100ms = sum(1 for t in assignment_times if t <= 100)
-        
         return {
             "total_assignments": len(assignments),
-            "avg_assignment_time_ms": sum(assignment_times) / len(assignment_times),
-            "max_assignment_time_ms": max(assignment_times),
-            "min_assignment_time_ms": min(assignment_times),
+            "avg_assignment_time_ms": total / count,
+            "max_assignment_time_ms": max_time,
+            "min_assignment_time_ms": min_time,
+            "assignments_under_100ms": under_100ms,
+            "performance_compliance_rate": under_100ms / count
+        }
+    
+    def _get_assignment_metrics_vectorized(self, assignments: List[Assignment]) -> dict:
+        """NumPy reduction path for very large assignment batches"""
+        times = np.fromiter(
+            (a.assignment_time_ms for a in assignments if a.assignment_time_ms is not None),
+            dtype=np.float64
+        )
+        return self.get_assignment_metrics_from_array(times, total_assignments=len(assignments))
+
+    def get_assignment_metrics_from_array(self, times: np.ndarray,
+                                          total_assignments: int = None) -> dict:
+        """
+        Calculate assignment metrics from a timings array
+
+        Fast path for callers (simulators, load generators) that already
+        hold assignment times as an ndarray: all four statistics come
+        from vectorized reductions with no entity objects in between.
+        NaN entries are treated as missing timings.
+
+        Args:
+            times: Assignment times in milliseconds
+            total_assignments: Reported batch size (defaults to the
+                number of non-missing timings)
+        """
+        times = np.asarray(times, dtype=np.float64)
+        times = times[~np.isnan(times)]
+        
+        if total_assignments is None:
+            total_assignments = times.size
+        
+        if times.size == 0:
+            return {
+                "total_assignments": total_assignments,
+                "avg_assignment_time_ms": 0,
+                "max_assignment_time_ms": 0,
+                "min_assignment_time_ms": 0,
+                "assignments_under_100ms": 0,
+                "performance_compliance_rate": 0
+            }
+        
+        under_100ms = int(np.count_nonzero(times <= 100))
+        
+        return {
+            "total_assignments": total_assignments,
+            "avg_assignment_time_ms": float(times.mean()),
+            "max_assignment_time_ms": float(times.max()),
+            "min_assignment_time_ms": float(times.min()),
             "assignments_under_100ms": under_100ms,
-            "performance_compliance_rate": under_100ms / len(assignment_times) if assignment_times else 0
+            "performance_compliance_rate": under_100ms / times.size
         }
\ No newline at end of file
@@ -6,6 +6,11 @@ from domain.entities.call import Call, QualificationResult
 from domain.entities.agent import Agent
 from domain.entities.assignment import Assignment
 
+# Standard-normal draws buffered for the scalar duration API; one
+# vectorized refill amortizes NumPy's per-call dispatch across 1024
+# scalar requests
+_NORMAL_BUFFER_SIZE = 1024
+
 class QualificationService:
     """Domain service for call qualification based on conversion matrix"""
     
@@ -18,6 +23,34 @@ class QualificationService:
         """
         self.conversion_matrix = conversion_matrix
         self.random_generator = np.random.default_rng()
+        # Flat (agent_type, call_type) -> probability lookup for batch paths
+        self._prob_lookup = {
+            (agent_type, call_type): probability
+            for agent_type, row in conversion_matrix.items()
+            for call_type, probability in row.items()
+        }
+        # Dense integer-coded view of the matrix: type strings map to
+        # small codes once, then a probability is one 2-D array index
+        # instead of nested dict probes
+        self._agent_codes = {
+            agent_type: code for code, agent_type in enumerate(conversion_matrix)
+        }
+        all_call_types = sorted({
+            call_type for row in conversion_matrix.values() for call_type in row
+        })
+        self._call_codes = {
+            call_type: code for code, call_type in enumerate(all_call_types)
+        }
+        self._prob_matrix = np.zeros(
+            (len(self._agent_codes), len(self._call_codes)), dtype=np.float32
+        )
+        for agent_type, row in conversion_matrix.items():
+            for call_type, probability in row.items():
+                self._prob_matrix[
+                    self._agent_codes[agent_type], self._call_codes[call_type]
+                ] = probability
+        self._normal_buffer = np.empty(0)
+        self._normal_pos = 0
     
     def qualify_call(self, agent_type: str, call_type: str) -> QualificationResult:
         """
@@ -38,19 +71,107 @@ class QualificationService:
         
         return QualificationResult.OK if result == 1 else QualificationResult.KO
     
+    def qualify_calls_batch(self, agent_types: List[str], call_types: List[str]) -> List[QualificationResult]:
+        """
+        Qualify many calls with a single vectorized binomial draw
+
+        Args:
+            agent_types: Agent type per call, parallel to call_types
+            call_types: Call type per call
+
+        Returns:
+            List of QualificationResult, one per input pair
+        """
+        n = len(agent_types)
+        if n == 0:
+            return []
+
+        ok_mask = self.qualify_calls_coded(
+            self.encode_agent_types(agent_types),
+            self.encode_call_types(call_types)
+        )
+
+        ok, ko = QualificationResult.OK, QualificationResult.KO
+        return [ok if is_ok else ko for is_ok in ok_mask]
+
+    def encode_agent_types(self, agent_types: List[str]) -> np.ndarray:
+        """Map agent type strings to integer codes (-1 for unknown)"""
+        codes = self._agent_codes
+        return np.fromiter(
+            (codes.get(agent_type, -1) for agent_type in agent_types),
+            dtype=np.intp,
+            count=len(agent_types)
+        )
+
+    def encode_call_types(self, call_types: List[str]) -> np.ndarray:
+        """Map call type strings to integer codes (-1 for unknown)"""
+        codes = self._call_codes
+        return np.fromiter(
+            (codes.get(call_type, -1) for call_type in call_types),
+            dtype=np.intp,
+            count=len(call_types)
+        )
+
+    def qualify_calls_coded(self, agent_codes: np.ndarray, call_codes: np.ndarray) -> np.ndarray:
+        """
+        Qualify integer-coded calls with one fancy-index and one draw
+
+        One gather from the dense probability matrix plus a single
+        rng.random(n) comparison; no strings, dicts or Python loop.
+        Unknown codes (-1) qualify with probability 0.
+
+        Returns:
+            Boolean array, True where the call converted (OK)
+        """
+        n = len(agent_codes)
+        valid = (agent_codes >= 0) & (call_codes >= 0)
+
+        probs = np.zeros(n, dtype=np.float32)
+        probs[valid] = self._prob_matrix[agent_codes[valid], call_codes[valid]]
+
+        return self.random_generator.random(n) < probs
+
+    def generate_durations(self, means, stds) -> np.ndarray:
+        """
+        Generate many call durations with one vectorized normal draw
+
+        Args:
+            means: Mean duration per call in seconds (scalar or array-like)
+            stds: Standard deviation per call in seconds (scalar or array-like)
+
+        Returns:
+            Array of durations in seconds (minimum 1 second each)
+        """
+        durations = self.random_generator.normal(means, stds)
+        return np.maximum(durations, 1.0)
+
     def get_conversion_probability(self, agent_type: str, call_type: str) -> float:
-        """Get conversion probability for agent type and call type combination"""
-        if agent_type not in self.conversion_matrix:
-            return 0.0
-        
-        if call_type not in self.conversion_matrix[agent_type]:
+        """Get conversion probability for agent type and call type combination
+
+        Served from the flat tuple-keyed lookup built at init: one hash
+        probe instead of the two chained dict probes the raw
+        conversion_matrix would cost.
+        """
+        return self._prob_lookup.get((agent_type, call_type), 0.0)
+
+    def get_conversion_probability_coded(self, agent_code: int, call_code: int) -> float:
+        """Probability by integer codes: one address computation, no hashing
+
+        For callers that already hold codes from encode_agent_types /
+        encode_call_types and probe in a loop.
+        """
+        if agent_code < 0 or call_code < 0:
             return 0.0
-        
-        return self.conversion_matrix[agent_type][call_type]
+        return float(self._prob_matrix[agent_code, call_code])
     
     def calculate_expected_conversion_rate(self, agent_type: str, call_type: str) -> float:
-        """Calculate expected conversion rate for a combination"""
-        return self.get_conversion_probability(agent_type, call_type)
+        """Calculate expected conversion rate for a combination
+
+        Pure function of its arguments, answered straight from the
+        tuple-keyed map precomputed at init — no extra delegation frame
+        and nothing to cache beyond the map itself.
+        """
+        return self._prob_lookup.get((agent_type, call_type), 0.0)
     
     def generate_duration(self, mean_seconds: float, std_seconds: float) -> float:
         """
@@ -63,8 +184,14 @@ class QualificationService:
         Returns:
             Duration in seconds (minimum 1 second)
         """
-        duration = self.random_generator.normal(mean_seconds, std_seconds)
-        return max(1.0, duration)  # Ensure minimum 1 second duration
+        # Draw from the pre-filled standard-normal buffer and scale;
+        # a lone rng.normal() call pays full NumPy dispatch for one value
+        if self._normal_pos >= self._normal_buffer.size:
+            self._normal_buffer = self.random_generator.standard_normal(_NORMAL_BUFFER_SIZE)
+            self._normal_pos = 0
+        z = self._normal_buffer[self._normal_pos]
+        self._normal_pos += 1
+        return max(1.0, mean_seconds + std_seconds * float(z))  # Ensure minimum 1 second duration
     
     def analyze_qualification_results(self, assignments: List[Assignment], 
                                     calls: List[Call], agents: List[Agent]) -> Dict:
@@ -78,8 +205,14 @@ class QualificationService:
         call_map = {call.id: call for call in calls}
         agent_map = {agent.id: agent for agent in agents}
         
-        # Group results by agent_type and call_type
-        results_by_combination = defaultdict(list)
+        # One Python pass to code the completed rows (types observed in
+        # the data get local codes, so types outside the matrix still
+        # aggregate); all counting then happens in vectorized bincounts
+        agent_idx: Dict[str, int] = {}
+        call_idx: Dict[str, int] = {}
+        agent_codes = []
+        call_codes = []
+        ok_flags = []
         
         for assignment in assignments:
             if assignment.status.value != "COMPLETED":
@@ -91,10 +224,10 @@ class QualificationService:
             if not call or not agent:
                 continue
             
-            key = (agent.agent_type, call.call_type)
-            results_by_combination[key].append(call.qualification_result)
+            agent_codes.append(agent_idx.setdefault(agent.agent_type, len(agent_idx)))
+            call_codes.append(call_idx.setdefault(call.call_type, len(call_idx)))
+            ok_flags.append(call.qualification_result == QualificationResult.OK)
         
-        # Calculate actual vs expected rates
         analysis = {
             "combinations": {},
             "overall_stats": {
@@ -104,15 +237,86 @@ class QualificationService:
             }
         }
         
+        if not agent_codes:
+            return analysis
+        
+        # Flatten (agent, call) code pairs to one bin per combination
+        # and reduce with two C-loop bincounts
+        n_call_types = len(call_idx)
+        n_bins = len(agent_idx) * n_call_types
+        flat = np.asarray(agent_codes, dtype=np.intp) * n_call_types + np.asarray(call_codes, dtype=np.intp)
+        totals = np.bincount(flat, minlength=n_bins)
+        ok_counts = np.bincount(
+            flat, weights=np.asarray(ok_flags, dtype=np.float64), minlength=n_bins
+        ).astype(np.int64)
+        
         total_completed = 0
         total_ok = 0
         
-        for (agent_type, call_type), results in results_by_combination.items():
-            ok_count = sum(1 for r in results if r == QualificationResult.OK)
-            total_calls = len(results)
+        for agent_type, a_code in agent_idx.items():
+            for call_type, c_code in call_idx.items():
+                total_calls = int(totals[a_code * n_call_types + c_code])
+                if total_calls == 0:
+                    continue
+                ok_count = int(ok_counts[a_code * n_call_types + c_code])
+                actual_rate = ok_count / total_calls
+                expected_rate = self.get_conversion_probability(agent_type, call_type)
+                
+                analysis["combinations"][f"{agent_type}_{call_type}"] = {
+                    "agent_type": agent_type,
+                    "call_type": call_type,
+                    "total_calls": total_calls,
+                    "ok_calls": ok_count,
+                    "ko_calls": total_calls - ok_count,
+                    "actual_conversion_rate": actual_rate,
+                    "expected_conversion_rate": expected_rate,
+                    "rate_difference": actual_rate - expected_rate,
+                    "rate_difference_percentage": ((actual_rate - expected_rate) / expected_rate * 100) if expected_rate > 0 else 0
+                }
+                
+                total_completed += total_calls
+                total_ok += ok_count
+        
+        analysis["overall_stats"] = {
+            "total_completed_calls": total_completed,
+            "total_ok_calls": total_ok,
+            "overall_conversion_rate": total_ok / total_completed if total_completed > 0 else 0.0
+        }
+        
+        return analysis
+
+    def analyze_qualification_counts(self, counts: List[Tuple[str, str, str, int]]) -> Dict:
+        """
+        Build the qualification analysis from pre-aggregated counts
+
+        Takes (agent_type, call_type, qualification_result, count) rows as
+        returned by CallRepository.get_qualification_counts, so the grouping
+        work stays in SQL and this method only pivots a handful of rows.
+        Produces the same structure as analyze_qualification_results.
+        """
+        analysis = {
+            "combinations": {},
+            "overall_stats": {
+                "total_completed_calls": 0,
+                "total_ok_calls": 0,
+                "overall_conversion_rate": 0.0
+            }
+        }
+
+        totals = defaultdict(lambda: [0, 0])  # (agent_type, call_type) -> [total, ok]
+        for agent_type, call_type, qualification, count in counts:
+            entry = totals[(agent_type, call_type)]
+            entry[0] += count
+            if qualification == QualificationResult.OK.value:
+                entry[1] += count
+
+        total_completed = 0
+        total_ok = 0
+
+        for (agent_type, call_type), (total_calls, ok_count) in totals.items():
             actual_rate = ok_count / total_calls if total_calls > 0 else 0.0
             expected_rate = self.get_conversion_probability(agent_type, call_type)
-            
+
             analysis["combinations"][f"{agent_type}_{call_type}"] = {
                 "agent_type": agent_type,
                 "call_type": call_type,
@@ -124,16 +328,16 @@ class QualificationService:
                 "rate_difference": actual_rate - expected_rate,
                 "rate_difference_percentage": ((actual_rate - expected_rate) / expected_rate * 100) if expected_rate > 0 else 0
             }
-            
+
             total_completed += total_calls
             total_ok += ok_count
-        
+
         analysis["overall_stats"] = {
             "total_completed_calls": total_completed,
             "total_ok_calls": total_ok,
             "overall_conversion_rate": total_ok / total_completed if total_completed > 0 else 0.0
         }
-        
+
         return analysis
     
     def validate_matrix_probabilities(self) -> bool:
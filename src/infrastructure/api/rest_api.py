@@ -1,13 +1,13 @@
-from fastapi import FastAPI, HTTPException, status, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, status, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
 import uuid
 import asyncio
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from fastapi.responses import Response
+from fastapi.responses import ORJSONResponse, Response
 
 from domain.entities.agent import Agent, AgentStatus
 from domain.entities.call import Call, CallStatus, QualificationResult
@@ -19,12 +19,37 @@ from config.settings import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Validation sets materialized once: O(1) membership per request instead
+# of scanning the settings lists, plus pre-rendered 400 detail strings
+_CALL_TYPES = frozenset(settings.call_types)
+_AGENT_TYPES = frozenset(settings.agent_types)
+_INVALID_CALL_TYPE_DETAIL = f"Invalid call_type. Must be one of: {settings.call_types}"
+_INVALID_AGENT_TYPE_DETAIL = f"Invalid agent_type. Must be one of: {settings.agent_types}"
+_INVALID_STATUS_DETAIL = f"Invalid status. Must be one of: {[s.value for s in AgentStatus]}"
+
+# Coarse timestamp cache for high-frequency handlers: refreshed by a
+# background task every 250ms, so those responses skip a clock read and
+# string format per request. Falls back to a live read until the task runs.
+_now_iso_cached = ""
+
+def _now_iso() -> str:
+    return _now_iso_cached or datetime.utcnow().isoformat()
+
+async def _refresh_now_iso():
+    global _now_iso_cached
+    while True:
+        _now_iso_cached = datetime.utcnow().isoformat()
+        await asyncio.sleep(0.25)
+
 # Pydantic models for API
 class CreateCallRequest(BaseModel):
     phone_number: str = Field(..., description="Phone number of the call")
     call_type: str = Field(..., description="Type of call (e.g., llamada_tipo_1)")
 
 class CallResponse(BaseModel):
+    # Read-only view over trusted internal data: immutable, no extras kept
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str
     phone_number: str
     call_type: str
@@ -42,6 +67,8 @@ class CreateAgentRequest(BaseModel):
     agent_type: str = Field(..., description="Type of agent (e.g., agente_tipo_1)")
 
 class AgentResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str
     name: str
     agent_type: str
@@ -56,6 +83,8 @@ class UpdateAgentStatusRequest(BaseModel):
     status: str = Field(..., description="New agent status (AVAILABLE, PAUSED, OFFLINE)")
 
 class AssignmentResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     success: bool
     assignment_id: Optional[str] = None
     agent_id: Optional[str] = None
@@ -64,6 +93,8 @@ class AssignmentResponse(BaseModel):
     message: str
 
 class SystemStatusResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     timestamp: str
     agents: Dict[str, int]
     active_assignments: int
@@ -74,7 +105,8 @@ class SystemStatusResponse(BaseModel):
 app = FastAPI(
     title="Call Assignment System",
     description="Multi-tenant call assignment system with high performance requirements",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -93,6 +125,7 @@ agent_repository = AgentRepository()
 async def startup_event():
     """Initialize services on startup"""
     from infrastructure.database.connection import db_connection
+    from infrastructure.database.metrics_writer import metrics_writer
     from infrastructure.cache.redis_client import redis_client
     
     logger.info("Starting Call Assignment System...")
@@ -101,20 +134,33 @@ async def startup_event():
     await db_connection.initialize()
     logger.info("Database initialized")
     
+    # Start the buffered metrics writer
+    await metrics_writer.start()
+    
     # Initialize Redis
     await redis_client.initialize()
     logger.info("Redis initialized")
     
+    # Open the pooled webhook HTTP session
+    await call_orchestrator.webhook_client.start()
+    logger.info("Webhook client started")
+    
+    # Start the coarse timestamp refresher
+    asyncio.create_task(_refresh_now_iso())
+    
     logger.info("Call Assignment System started successfully")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     from infrastructure.database.connection import db_connection
+    from infrastructure.database.metrics_writer import metrics_writer
     from infrastructure.cache.redis_client import redis_client
     
     logger.info("Shutting down Call Assignment System...")
     
+    await call_orchestrator.webhook_client.close()
+    await metrics_writer.close()
     await db_connection.close()
     await redis_client.close()
     
@@ -128,7 +174,7 @@ async def health_check():
     
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
         "redis_connected": await redis_client.health_check()
     }
 
@@ -145,10 +191,10 @@ async def create_and_assign_call(request: CreateCallRequest):
         )
         
         # Validate call type
-        if call.call_type not in settings.call_types:
+        if call.call_type not in _CALL_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid call_type. Must be one of: {settings.call_types}"
+                detail=_INVALID_CALL_TYPE_DETAIL
             )
         
         # Attempt assignment
@@ -207,8 +253,9 @@ async def get_call(call_id: str):
                 detail=f"Call {call_id} not found"
             )
         
-        # Convert to response model
-        response = CallResponse(
+        # Convert to response model; the data comes from our own cache,
+        # so skip Pydantic validation with model_construct
+        response = CallResponse.model_construct(
             id=call_data["id"],
             phone_number=call_data["phone_number"],
             call_type=call_data["call_type"],
@@ -237,10 +284,10 @@ async def create_agent(request: CreateAgentRequest):
     """Create a new agent"""
     try:
         # Validate agent type
-        if request.agent_type not in settings.agent_types:
+        if request.agent_type not in _AGENT_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid agent_type. Must be one of: {settings.agent_types}"
+                detail=_INVALID_AGENT_TYPE_DETAIL
             )
         
         # Create agent entity
@@ -253,7 +300,7 @@ async def create_agent(request: CreateAgentRequest):
         # Save agent
         saved_agent = await agent_repository.save(agent)
         
-        return AgentResponse(**saved_agent.to_dict())
+        return AgentResponse.model_construct(**saved_agent.to_dict())
         
     except HTTPException:
         raise
@@ -264,12 +311,28 @@ async def create_agent(request: CreateAgentRequest):
             detail=f"Internal server error: {str(e)}"
         )
 
-@app.get("/agents", response_model=List[AgentResponse])
-async def get_agents():
+@app.get("/agents")
+async def get_agents(request: Request):
     """Get all agents"""
     try:
+        from infrastructure.cache.redis_client import redis_client
+        
+        # agents_version increments on every agent write; if the poller
+        # already has this version, skip the read and serialization
+        version = await redis_client.get_agents_version()
+        etag = f'"{version}"' if version else None
+        if etag and request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        
+        # Postgres aggregates the rows into one JSON array; pass the bytes
+        # straight through without hydrating entities or Pydantic models
+        body = await agent_repository.find_all_as_json()
+        if body is not None:
+            headers = {"ETag": etag} if etag else None
+            return Response(content=body, media_type="application/json", headers=headers)
+        
         agents = await agent_repository.find_all()
-        return [AgentResponse(**agent.to_dict()) for agent in agents]
+        return [AgentResponse.model_construct(**agent.to_dict()) for agent in agents]
         
     except Exception as e:
         logger.error(f"Error getting agents: {str(e)}")
@@ -290,7 +353,7 @@ async def get_agent(agent_id: str):
                 detail=f"Agent {agent_id} not found"
             )
         
-        return AgentResponse(**agent.to_dict())
+        return AgentResponse.model_construct(**agent.to_dict())
         
     except HTTPException:
         raise
@@ -311,21 +374,19 @@ async def update_agent_status(agent_id: str, request: UpdateAgentStatusRequest):
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status. Must be one of: {[s.value for s in AgentStatus]}"
+                detail=_INVALID_STATUS_DETAIL
             )
         
-        # Update status
-        success = await agent_repository.update_status(agent_id, new_status)
+        # Update and fetch in one statement via UPDATE ... RETURNING
+        agent = await agent_repository.update_status_returning(agent_id, new_status)
         
-        if not success:
+        if not agent:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Agent {agent_id} not found"
             )
         
-        # Return updated agent
-        agent = await agent_repository.find_by_id(agent_id)
-        return AgentResponse(**agent.to_dict())
+        return AgentResponse.model_construct(**agent.to_dict())
         
     except HTTPException:
         raise
@@ -341,7 +402,7 @@ async def get_available_agents():
     """Get all available agents ordered by idle time"""
     try:
         agents = await agent_repository.find_available()
-        return [AgentResponse(**agent.to_dict()) for agent in agents]
+        return [AgentResponse.model_construct(**agent.to_dict()) for agent in agents]
         
     except Exception as e:
         logger.error(f"Error getting available agents: {str(e)}")
@@ -382,7 +443,7 @@ async def get_metrics():
         
         metrics = await redis_client.get_all_metrics()
         return {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "metrics": metrics
         }
         
@@ -395,12 +456,20 @@ async def get_metrics():
     
 
 
+# Debug endpoint for pool tuning
+@app.get("/debug/pool")
+async def get_pool_status():
+    """Inspect database connection pool state"""
+    from infrastructure.database.connection import db_connection
+    
+    return {"pool": db_connection.pool_status()}
+
 # Webhook receiver for testing
 @app.post("/webhook")
 async def receive_webhook(payload: Dict[str, Any]):
     """Receive webhook notifications (for testing purposes)"""
     logger.info(f"Received webhook: {payload.get('event_type', 'unknown')}")
-    return {"status": "received", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "received", "timestamp": _now_iso()}
 
 
 calls_total = Counter('calls_total', 'Total calls processed', ['call_type', 'status'])
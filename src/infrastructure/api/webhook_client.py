@@ -1,7 +1,11 @@
-import aiohttp
-import json
+import asyncio
 import logging
-from typing import Dict, Any
+import sys
+
+import httpx
+
+import msgspec
+from typing import List, Optional
 from datetime import datetime
 
 from domain.entities.agent import Agent
@@ -11,145 +15,341 @@ from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Delivery queue sizing: bounded so a dead receiver cannot grow memory
+# without limit; events beyond the bound are dropped with a warning
+_QUEUE_MAXSIZE = 10_000
+_MAX_BATCH = 50
+_NUM_WORKERS = 4
+
+# Shared constant headers; per-send dicts are derived with a single
+# dict-merge instead of rebuilding every key
+_BASE_HEADERS = {
+    "Content-Type": "application/json",
+    "X-Event-Source": "call-assignment-system"
+}
+
+# Interned event-type strings: downstream dict lookups and comparisons
+# become pointer checks
+_EVENT_ASSIGNED = sys.intern("CALL_ASSIGNED")
+_EVENT_COMPLETED = sys.intern("CALL_COMPLETED")
+_EVENT_SATURATED = sys.intern("SYSTEM_SATURATED")
+_EVENT_AGENT_STATUS = sys.intern("AGENT_STATUS_CHANGED")
+_EVENT_HEALTH_CHECK = sys.intern("HEALTH_CHECK")
+
+# Event payloads as frozen slotted msgspec Structs: construction is a
+# C-level allocation instead of 3-4 nested dicts per notification, and
+# msgspec.json.encode serializes them without dict intermediaries
+class AssignmentBody(msgspec.Struct, frozen=True):
+    assignment_id: str
+    call_id: str
+    agent_id: str
+    assignment_time_ms: Optional[float]
+    expected_duration_seconds: Optional[float]
+
+class AssignedCallBody(msgspec.Struct, frozen=True):
+    call_id: str
+    phone_number: str
+    call_type: str
+    created_at: str
+    assigned_at: Optional[str]
+
+class CompletedCallBody(msgspec.Struct, frozen=True):
+    call_id: str
+    phone_number: str
+    call_type: str
+    status: str
+    qualification_result: str
+    duration_seconds: Optional[float]
+    created_at: str
+    assigned_at: Optional[str]
+    completed_at: Optional[str]
+
+class SaturatedCallBody(msgspec.Struct, frozen=True):
+    call_id: str
+    phone_number: str
+    call_type: str
+    created_at: str
+
+class AgentBody(msgspec.Struct, frozen=True):
+    agent_id: str
+    name: str
+    agent_type: str
+    status: str
+
+class AgentStatusBody(msgspec.Struct, frozen=True):
+    agent_id: str
+    name: str
+    agent_type: str
+    previous_status: str
+    current_status: str
+    updated_at: str
+
+class AssignmentAttemptBody(msgspec.Struct, frozen=True):
+    assignment_time_ms: float
+    status: str
+
+class AssignmentEvent(msgspec.Struct, frozen=True):
+    event_type: str
+    timestamp: str
+    assignment: AssignmentBody
+    call: AssignedCallBody
+    agent: AgentBody
+
+class CompletionEvent(msgspec.Struct, frozen=True):
+    event_type: str
+    timestamp: str
+    call: CompletedCallBody
+    agent: AgentBody
+
+class SaturationEvent(msgspec.Struct, frozen=True):
+    event_type: str
+    timestamp: str
+    call: SaturatedCallBody
+    assignment_attempt: AssignmentAttemptBody
+
+class AgentStatusEvent(msgspec.Struct, frozen=True):
+    event_type: str
+    timestamp: str
+    agent: AgentStatusBody
+
+class HealthCheckEvent(msgspec.Struct, frozen=True):
+    event_type: str
+    timestamp: str
+
 class WebhookClient:
     """Client for sending webhooks to external systems"""
-    
+
     def __init__(self):
         self.webhook_url = settings.webhook_url
         self.timeout = settings.webhook_timeout
-        
+        self._client: httpx.AsyncClient = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_MAXSIZE)
+        self._workers: list = []
+
+    async def start(self):
+        """Create the pooled HTTP client and spawn the delivery workers"""
+        if self._client is None:
+            # HTTP/2 multiplexes concurrent event posts over one
+            # connection instead of one socket per in-flight request
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=200,
+                    max_keepalive_connections=100
+                )
+            )
+
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._delivery_worker())
+                for _ in range(_NUM_WORKERS)
+            ]
+
+    async def close(self):
+        """Drain pending deliveries, stop workers and close the session"""
+        if self._workers:
+            await self._queue.join()
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _delivery_worker(self):
+        """Drain the queue in batches and post events concurrently"""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < _MAX_BATCH and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                if settings.webhook_batch_ndjson and len(batch) > 1:
+                    await self._send_webhook_batch(batch)
+                else:
+                    await asyncio.gather(*(self._send_webhook(event) for event in batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _dispatch(self, event) -> bool:
+        """Enqueue for the workers, or send inline when none are running"""
+        if not self._workers:
+            return await self._send_webhook(event)
+
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"Webhook queue full, dropping event: {event.event_type}")
+            return False
+
     async def notify_assignment(self, assignment: Assignment, agent: Agent, call: Call) -> bool:
         """Notify external system of call assignment"""
-        payload = {
-            "event_type": "CALL_ASSIGNED",
-            "timestamp": datetime.utcnow().isoformat(),
-            "assignment": {
-                "assignment_id": assignment.id,
-                "call_id": assignment.call_id,
-                "agent_id": assignment.agent_id,
-                "assignment_time_ms": assignment.assignment_time_ms,
-                "expected_duration_seconds": assignment.expected_duration_seconds
-            },
-            "call": {
-                "call_id": call.id,
-                "phone_number": call.phone_number,
-                "call_type": call.call_type,
-                "created_at": call.created_at.isoformat(),
-                "assigned_at": call.assigned_at.isoformat() if call.assigned_at else None
-            },
-            "agent": {
-                "agent_id": agent.id,
-                "name": agent.name,
-                "agent_type": agent.agent_type,
-                "status": agent.status.value
-            }
-        }
-        
-        return await self._send_webhook(payload)
-    
+        event = AssignmentEvent(
+            event_type=_EVENT_ASSIGNED,
+            timestamp=datetime.utcnow().isoformat(),
+            assignment=AssignmentBody(
+                assignment_id=assignment.id,
+                call_id=assignment.call_id,
+                agent_id=assignment.agent_id,
+                assignment_time_ms=assignment.assignment_time_ms,
+                expected_duration_seconds=assignment.expected_duration_seconds
+            ),
+            call=AssignedCallBody(
+                call_id=call.id,
+                phone_number=call.phone_number,
+                call_type=call.call_type,
+                created_at=call.created_at.isoformat(),
+                assigned_at=call.assigned_at.isoformat() if call.assigned_at else None
+            ),
+            agent=AgentBody(
+                agent_id=agent.id,
+                name=agent.name,
+                agent_type=agent.agent_type,
+                status=agent.status.value
+            )
+        )
+
+        return await self._dispatch(event)
+
     async def notify_completion(self, call: Call, agent: Agent, qualification: QualificationResult) -> bool:
         """Notify external system of call completion"""
-        payload = {
-            "event_type": "CALL_COMPLETED",
-            "timestamp": datetime.utcnow().isoformat(),
-            "call": {
-                "call_id": call.id,
-                "phone_number": call.phone_number,
-                "call_type": call.call_type,
-                "status": call.status.value,
-                "qualification_result": qualification.value,
-                "duration_seconds": call.duration_seconds,
-                "created_at": call.created_at.isoformat(),
-                "assigned_at": call.assigned_at.isoformat() if call.assigned_at else None,
-                "completed_at": call.completed_at.isoformat() if call.completed_at else None
-            },
-            "agent": {
-                "agent_id": agent.id,
-                "name": agent.name,
-                "agent_type": agent.agent_type,
-                "status": agent.status.value
-            }
-        }
-        
-        return await self._send_webhook(payload)
-    
+        event = CompletionEvent(
+            event_type=_EVENT_COMPLETED,
+            timestamp=datetime.utcnow().isoformat(),
+            call=CompletedCallBody(
+                call_id=call.id,
+                phone_number=call.phone_number,
+                call_type=call.call_type,
+                status=call.status.value,
+                qualification_result=qualification.value,
+                duration_seconds=call.duration_seconds,
+                created_at=call.created_at.isoformat(),
+                assigned_at=call.assigned_at.isoformat() if call.assigned_at else None,
+                completed_at=call.completed_at.isoformat() if call.completed_at else None
+            ),
+            agent=AgentBody(
+                agent_id=agent.id,
+                name=agent.name,
+                agent_type=agent.agent_type,
+                status=agent.status.value
+            )
+        )
+
+        return await self._dispatch(event)
+
     async def notify_saturation(self, call: Call, assignment_time_ms: float) -> bool:
         """Notify external system of saturation (no agents available)"""
-        payload = {
-            "event_type": "SYSTEM_SATURATED",
-            "timestamp": datetime.utcnow().isoformat(),
-            "call": {
-                "call_id": call.id,
-                "phone_number": call.phone_number,
-                "call_type": call.call_type,
-                "created_at": call.created_at.isoformat()
-            },
-            "assignment_attempt": {
-                "assignment_time_ms": assignment_time_ms,
-                "status": "NO_AGENTS_AVAILABLE"
-            }
-        }
-        
-        return await self._send_webhook(payload)
-    
+        event = SaturationEvent(
+            event_type=_EVENT_SATURATED,
+            timestamp=datetime.utcnow().isoformat(),
+            call=SaturatedCallBody(
+                call_id=call.id,
+                phone_number=call.phone_number,
+                call_type=call.call_type,
+                created_at=call.created_at.isoformat()
+            ),
+            assignment_attempt=AssignmentAttemptBody(
+                assignment_time_ms=assignment_time_ms,
+                status="NO_AGENTS_AVAILABLE"
+            )
+        )
+
+        return await self._dispatch(event)
+
     async def notify_agent_status_change(self, agent: Agent, previous_status: str) -> bool:
         """Notify external system of agent status change"""
-        payload = {
-            "event_type": "AGENT_STATUS_CHANGED",
-            "timestamp": datetime.utcnow().isoformat(),
-            "agent": {
-                "agent_id": agent.id,
-                "name": agent.name,
-                "agent_type": agent.agent_type,
-                "previous_status": previous_status,
-                "current_status": agent.status.value,
-                "updated_at": agent.updated_at.isoformat()
+        event = AgentStatusEvent(
+            event_type=_EVENT_AGENT_STATUS,
+            timestamp=datetime.utcnow().isoformat(),
+            agent=AgentStatusBody(
+                agent_id=agent.id,
+                name=agent.name,
+                agent_type=agent.agent_type,
+                previous_status=previous_status,
+                current_status=agent.status.value,
+                updated_at=agent.updated_at.isoformat()
+            )
+        )
+
+        return await self._dispatch(event)
+
+    async def _send_webhook_batch(self, batch: List) -> bool:
+        """Send a batch of events as one newline-delimited JSON request"""
+        try:
+            if self._client is None:
+                await self.start()
+
+            body = b"\n".join(msgspec.json.encode(event) for event in batch)
+
+            headers = _BASE_HEADERS | {
+                "Content-Type": "application/x-ndjson",
+                "X-Event-Timestamp": batch[0].timestamp
             }
-        }
-        
-        return await self._send_webhook(payload)
-    
-    async def _send_webhook(self, payload: Dict[str, Any]) -> bool:
-        """Send webhook with payload"""
+
+            response = await self._client.post(
+                self.webhook_url,
+                content=body,
+                headers=headers
+            )
+            if response.status_code == 200:
+                logger.info(f"Webhook batch sent successfully: {len(batch)} events")
+                return True
+            logger.error(f"Webhook batch failed with status {response.status_code}")
+            return False
+
+        except httpx.HTTPError as e:
+            logger.error(f"Webhook batch client error: {str(e)}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected webhook batch error: {str(e)}")
+            return False
+
+    async def _send_webhook(self, event) -> bool:
+        """Send webhook with payload over the pooled session"""
         try:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                headers = {
-                    "Content-Type": "application/json",
-                    "X-Event-Source": "call-assignment-system",
-                    "X-Event-Timestamp": datetime.utcnow().isoformat()
-                }
-                
-                async with session.post(
-                    self.webhook_url,
-                    json=payload,
-                    headers=headers
-                ) as response:
-                    if response.status == 200:
-                        logger.info(f"Webhook sent successfully: {payload['event_type']}")
-                        return True
-                    else:
-                        logger.error(f"Webhook failed with status {response.status}: {payload['event_type']}")
-                        return False
-                        
-        except aiohttp.ClientError as e:
+            if self._client is None:
+                # Lazy start for callers that never ran the startup hook
+                await self.start()
+
+            # Reuse the timestamp already formatted into the payload
+            # instead of formatting utcnow a second time per send
+            headers = _BASE_HEADERS | {"X-Event-Timestamp": event.timestamp}
+
+            # msgspec + content= skips any stdlib json re-encode
+            response = await self._client.post(
+                self.webhook_url,
+                content=msgspec.json.encode(event),
+                headers=headers
+            )
+            if response.status_code == 200:
+                logger.info(f"Webhook sent successfully: {event.event_type}")
+                return True
+            else:
+                logger.error(f"Webhook failed with status {response.status_code}: {event.event_type}")
+                return False
+
+        except httpx.HTTPError as e:
             logger.error(f"Webhook client error: {str(e)}")
             return False
         except Exception as e:
             logger.error(f"Unexpected webhook error: {str(e)}")
             return False
-    
+
     async def health_check(self) -> bool:
         """Check if webhook endpoint is responsive"""
         try:
-            payload = {
-                "event_type": "HEALTH_CHECK",
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            return await self._send_webhook(payload)
-            
+            event = HealthCheckEvent(
+                event_type=_EVENT_HEALTH_CHECK,
+                timestamp=datetime.utcnow().isoformat()
+            )
+
+            return await self._send_webhook(event)
+
         except Exception as e:
             logger.error(f"Webhook health check failed: {str(e)}")
-            return False
\ No newline at end of file
+            return False
@@ -1,5 +1,7 @@
 import redis.asyncio as redis
 import json
+import logging
+import time
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
@@ -7,68 +9,170 @@ from config.settings import settings
 from domain.entities.agent import Agent, AgentStatus
 from domain.entities.call import Call, CallStatus
 
+logger = logging.getLogger(__name__)
+
+# Atomic assignment state transition: writes the call and agent hashes,
+# drops the agent from the availability set and the call from the pending
+# queue in one server-side step instead of four round-trips.
+# KEYS: call hash key, agent hash key
+# ARGV: call_id, agent_id, number of call k/v args, call k/v..., agent k/v...
+_ASSIGN_SCRIPT = """
+local ncall = tonumber(ARGV[3])
+local idx = 4
+local call_args = {}
+for i = 1, ncall do
+    call_args[i] = ARGV[idx]
+    idx = idx + 1
+end
+redis.call('HSET', KEYS[1], unpack(call_args))
+local agent_args = {}
+local j = 1
+while idx <= #ARGV do
+    agent_args[j] = ARGV[idx]
+    idx = idx + 1
+    j = j + 1
+end
+local old_status = redis.call('HGET', KEYS[2], 'status')
+redis.call('HSET', KEYS[2], unpack(agent_args))
+local new_status = redis.call('HGET', KEYS[2], 'status')
+if old_status ~= new_status then
+    if old_status then
+        redis.call('HINCRBY', 'agent_status_counts', old_status, -1)
+    end
+    redis.call('HINCRBY', 'agent_status_counts', new_status, 1)
+end
+redis.call('ZREM', 'available_agents', ARGV[2])
+redis.call('ZREM', 'pending_calls', ARGV[1])
+redis.call('INCR', 'agents_version')
+return 1
+"""
+
 class RedisClient:
     """Redis client for real-time state management"""
     
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
+        self._assign_sha: Optional[str] = None
     
     async def initialize(self):
-        """Initialize Redis connection"""
-        self.redis = redis.from_url(
+        """Initialize Redis connection pool (idempotent)"""
+        if self.redis is not None:
+            return
+        
+        # Explicit pool bound so concurrent API workers don't serialize on
+        # the default pool; hiredis (in requirements) gives the C parser
+        pool = redis.ConnectionPool.from_url(
             settings.redis_url,
+            max_connections=settings.redis_max_connections,
             encoding="utf-8",
             decode_responses=True,
             socket_keepalive=True,
             socket_keepalive_options={},
             health_check_interval=30
         )
+        self.redis = redis.Redis(connection_pool=pool)
         
         # Test connection
         await self.redis.ping()
+        
+        # Preload the atomic assignment script
+        self._assign_sha = await self.redis.script_load(_ASSIGN_SCRIPT)
     
     async def close(self):
         """Close Redis connection"""
         if self.redis:
             await self.redis.close()
+            self.redis = None
+            self._assign_sha = None
     
     # Agent operations
+    @staticmethod
+    def _agent_status_payload(agent: Agent) -> Dict[str, str]:
+        """Build the Redis hash payload for an agent"""
+        # Calculate idle time safely
+        idle_time = agent.get_idle_time_seconds()
+        if idle_time == float('inf'):
+            idle_time = 999999  # Large number for sorting, but finite
+        
+        return {
+            "id": str(agent.id),
+            "name": agent.name or "",
+            "agent_type": agent.agent_type or "",
+            "status": agent.status.value if agent.status else "OFFLINE",
+            "last_call_end_time": agent.last_call_end_time.isoformat() if agent.last_call_end_time else "",
+            "current_call_id": str(agent.current_call_id) if agent.current_call_id else "",
+            "updated_at": agent.updated_at.isoformat() if agent.updated_at else datetime.utcnow().isoformat(),
+            "idle_time_seconds": str(idle_time)
+        }
+
     async def set_agent_status(self, agent: Agent):
         """Set agent status in Redis"""
         try:
             key = f"agent:{agent.id}:status"
+            data = self._agent_status_payload(agent)
+            idle_time = float(data["idle_time_seconds"])
             
-            # Calculate idle time safely
-            idle_time = agent.get_idle_time_seconds()
-            if idle_time == float('inf'):
-                idle_time = 999999  # Large number for sorting, but finite
-            
-            data = {
-                "id": str(agent.id),
-                "name": agent.name or "",
-                "agent_type": agent.agent_type or "",
-                "status": agent.status.value if agent.status else "OFFLINE",
-                "last_call_end_time": agent.last_call_end_time.isoformat() if agent.last_call_end_time else "",
-                "current_call_id": str(agent.current_call_id) if agent.current_call_id else "",
-                "updated_at": agent.updated_at.isoformat() if agent.updated_at else datetime.utcnow().isoformat(),
-                "idle_time_seconds": str(idle_time)
-            }
+            # Keep the O(1) per-status counters in step with the write
+            old_status = await self.redis.hget(key, "status")
+            
+            # Ship the hash write and the sorted-set update in one round-trip
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(key, mapping=data)
+            pipe.incr("agents_version")
             
-            await self.redis.hset(key, mapping=data)
+            if old_status != data["status"]:
+                if old_status:
+                    pipe.hincrby("agent_status_counts", old_status, -1)
+                pipe.hincrby("agent_status_counts", data["status"], 1)
             
             # Update available agents sorted set if agent is available
             if agent.is_available():
-                await self.redis.zadd(
+                pipe.zadd(
                     "available_agents",
                     {str(agent.id): idle_time}
                 )
             else:
-                await self.redis.zrem("available_agents", str(agent.id))
+                pipe.zrem("available_agents", str(agent.id))
+            
+            await pipe.execute()
                 
         except Exception as e:
-            print(f"Redis set_agent_status error: {e}")
+            logger.warning("Redis set_agent_status failed: %s", e)
             # Don't re-raise to avoid breaking the main flow
     
+    async def set_agent_statuses(self, agents: List[Agent]):
+        """Set many agent statuses in two pipelined round-trips
+
+        One read pass collects the previous statuses (to keep the
+        agent_status_counts hash in step), then one write pass ships
+        every hash write and sorted-set update together.
+        """
+        if not agents:
+            return
+
+        try:
+            read = self.redis.pipeline(transaction=False)
+            for agent in agents:
+                read.hget(f"agent:{agent.id}:status", "status")
+            old_statuses = await read.execute()
+
+            pipe = self.redis.pipeline(transaction=False)
+            for agent, old_status in zip(agents, old_statuses):
+                data = self._agent_status_payload(agent)
+                pipe.hset(f"agent:{agent.id}:status", mapping=data)
+                if old_status != data["status"]:
+                    if old_status:
+                        pipe.hincrby("agent_status_counts", old_status, -1)
+                    pipe.hincrby("agent_status_counts", data["status"], 1)
+                if agent.is_available():
+                    pipe.zadd("available_agents", {str(agent.id): float(data["idle_time_seconds"])})
+                else:
+                    pipe.zrem("available_agents", str(agent.id))
+            pipe.incr("agents_version")
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Redis set_agent_statuses failed: %s", e)
+
     async def get_agent_status(self, agent_id: str) -> Optional[Dict]:
         """Get agent status from Redis"""
         try:
@@ -90,7 +194,7 @@ class RedisClient:
                 "idle_time_seconds": data.get("idle_time_seconds", "0")
             }
         except Exception as e:
-            print(f"Redis get_agent_status error: {e}")
+            logger.warning("Redis get_agent_status failed: %s", e)
             return None
     
     async def get_available_agents(self, limit: int = None) -> List[str]:
@@ -103,41 +207,95 @@ class RedisClient:
             
             return [str(agent_id) for agent_id in agent_ids] if agent_ids else []
         except Exception as e:
-            print(f"Redis get_available_agents error: {e}")
+            logger.warning("Redis get_available_agents failed: %s", e)
             return []
     
     async def remove_agent(self, agent_id: str):
         """Remove agent from Redis"""
         try:
-            await self.redis.delete(f"agent:{agent_id}:status")
-            await self.redis.zrem("available_agents", str(agent_id))
+            old_status = await self.redis.hget(f"agent:{agent_id}:status", "status")
+            
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(f"agent:{agent_id}:status")
+            pipe.zrem("available_agents", str(agent_id))
+            pipe.incr("agents_version")
+            if old_status:
+                pipe.hincrby("agent_status_counts", old_status, -1)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Redis remove_agent failed: %s", e)
+
+    async def get_agent_status_counts(self) -> Dict[str, int]:
+        """Per-status agent counters maintained on every agent write
+
+        O(1) replacement for scanning the agents table on each status
+        poll. Empty dict means the counters are cold (or Redis is down)
+        and the caller should fall back to counting from the database.
+        """
+        try:
+            counts = await self.redis.hgetall("agent_status_counts")
+            return {status: max(int(value), 0) for status, value in counts.items()}
+        except Exception as e:
+            logger.warning("Redis get_agent_status_counts failed: %s", e)
+            return {}
+    
+    async def get_agents_version(self) -> Optional[str]:
+        """Monotonic counter bumped on every agent write; used as an ETag"""
+        try:
+            return await self.redis.get("agents_version")
         except Exception as e:
-            print(f"Redis remove_agent error: {e}")
+            logger.warning("Redis get_agents_version failed: %s", e)
+            return None
     
     # Call operations
+    @staticmethod
+    def _call_status_payload(call: Call) -> Dict[str, str]:
+        """Build the Redis hash payload for a call"""
+        return {
+            "id": str(call.id),
+            "phone_number": call.phone_number or "",
+            "call_type": call.call_type or "",
+            "status": call.status.value if call.status else "PENDING",
+            "assigned_agent_id": str(call.assigned_agent_id) if call.assigned_agent_id else "",
+            "agent_type": call.agent_type or "",
+            "qualification_result": call.qualification_result.value if call.qualification_result else "PENDING",
+            "priority": str(call.priority),
+            "created_at": call.created_at.isoformat() if call.created_at else datetime.utcnow().isoformat(),
+            "assigned_at": call.assigned_at.isoformat() if call.assigned_at else "",
+            "completed_at": call.completed_at.isoformat() if call.completed_at else ""
+        }
+
     async def set_call_status(self, call: Call):
         """Set call status in Redis"""
         try:
             key = f"call:{call.id}:status"
-            data = {
-                "id": str(call.id),
-                "phone_number": call.phone_number or "",
-                "call_type": call.call_type or "",
-                "status": call.status.value if call.status else "PENDING",
-                "assigned_agent_id": str(call.assigned_agent_id) if call.assigned_agent_id else "",
-                "qualification_result": call.qualification_result.value if call.qualification_result else "PENDING",
-                "created_at": call.created_at.isoformat() if call.created_at else datetime.utcnow().isoformat(),
-                "assigned_at": call.assigned_at.isoformat() if call.assigned_at else "",
-                "completed_at": call.completed_at.isoformat() if call.completed_at else ""
-            }
+            data = self._call_status_payload(call)
             
-            await self.redis.hset(key, mapping=data)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(key, mapping=data)
             
             # Add to pending calls queue if pending
             if call.status == CallStatus.PENDING:
-                await self.redis.lpush("pending_calls", str(call.id))
+                pipe.zadd("pending_calls", {str(call.id): time.time()})
+            
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Redis set_call_status failed: %s", e)
+
+    async def set_call_statuses(self, calls: List[Call]):
+        """Set many call statuses in a single pipelined round-trip"""
+        if not calls:
+            return
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for call in calls:
+                pipe.hset(f"call:{call.id}:status", mapping=self._call_status_payload(call))
+                if call.status == CallStatus.PENDING:
+                    pipe.zadd("pending_calls", {str(call.id): time.time()})
+            await pipe.execute()
         except Exception as e:
-            print(f"Redis set_call_status error: {e}")
+            logger.warning("Redis set_call_statuses failed: %s", e)
     
     async def get_call_status(self, call_id: str) -> Optional[Dict]:
         """Get call status from Redis"""
@@ -150,26 +308,97 @@ class RedisClient:
             
             return data
         except Exception as e:
-            print(f"Redis get_call_status error: {e}")
+            logger.warning("Redis get_call_status failed: %s", e)
             return None
     
+    async def get_call_statuses(self, call_ids: List[str]) -> Dict[str, Dict]:
+        """Get multiple call statuses in a single pipelined round-trip"""
+        if not call_ids:
+            return {}
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for call_id in call_ids:
+                pipe.hgetall(f"call:{call_id}:status")
+            results = await pipe.execute()
+
+            return {
+                call_id: data
+                for call_id, data in zip(call_ids, results)
+                if data and data.get("id")
+            }
+        except Exception as e:
+            logger.warning("Redis get_call_statuses failed: %s", e)
+            return {}
+
     async def get_pending_calls(self, count: int = 10) -> List[str]:
-        """Get pending calls"""
+        """Get pending calls, oldest first"""
         try:
-            call_ids = await self.redis.lrange("pending_calls", 0, count - 1)
+            call_ids = await self.redis.zrange("pending_calls", 0, count - 1)
             return [str(call_id) for call_id in call_ids] if call_ids else []
         except Exception as e:
-            print(f"Redis get_pending_calls error: {e}")
+            logger.warning("Redis get_pending_calls failed: %s", e)
             return []
     
     async def remove_pending_call(self, call_id: str):
         """Remove call from pending queue"""
         try:
-            await self.redis.lrem("pending_calls", 0, str(call_id))
+            await self.redis.zrem("pending_calls", str(call_id))
         except Exception as e:
-            print(f"Redis remove_pending_call error: {e}")
+            logger.warning("Redis remove_pending_call failed: %s", e)
     
+    # Generic cache operations
+    async def cache_get(self, key: str) -> Optional[str]:
+        """Get a cached value by key"""
+        try:
+            return await self.redis.get(key)
+        except Exception as e:
+            logger.warning("Redis cache_get failed: %s", e)
+            return None
+
+    async def cache_set(self, key: str, value: str, ttl_seconds: int):
+        """Set a cached value with a TTL"""
+        try:
+            await self.redis.set(key, value, ex=ttl_seconds)
+        except Exception as e:
+            logger.warning("Redis cache_set failed: %s", e)
+
+    async def cache_delete(self, *keys: str):
+        """Delete cached values"""
+        try:
+            if keys:
+                await self.redis.delete(*keys)
+        except Exception as e:
+            logger.warning("Redis cache_delete failed: %s", e)
+
     # Assignment operations
+    async def atomic_assign(self, call: Call, agent: Agent) -> bool:
+        """Apply the whole assignment state transition in one round-trip"""
+        try:
+            if self._assign_sha is None:
+                self._assign_sha = await self.redis.script_load(_ASSIGN_SCRIPT)
+            
+            call_payload = self._call_status_payload(call)
+            agent_payload = self._agent_status_payload(agent)
+            call_args = [item for pair in call_payload.items() for item in pair]
+            agent_args = [item for pair in agent_payload.items() for item in pair]
+            
+            await self.redis.evalsha(
+                self._assign_sha,
+                2,
+                f"call:{call.id}:status",
+                f"agent:{agent.id}:status",
+                str(call.id),
+                str(agent.id),
+                str(len(call_args)),
+                *call_args,
+                *agent_args
+            )
+            return True
+        except Exception as e:
+            logger.warning("Redis atomic_assign failed: %s", e)
+            return False
+    
     async def create_assignment_lock(self, call_id: str, ttl_seconds: int = 5) -> bool:
         """Create distributed lock for assignment"""
         try:
@@ -177,7 +406,7 @@ class RedisClient:
             result = await self.redis.set(key, datetime.utcnow().isoformat(), nx=True, ex=ttl_seconds)
             return result is not None
         except Exception as e:
-            print(f"Redis create_assignment_lock error: {e}")
+            logger.warning("Redis create_assignment_lock failed: %s", e)
             return False
     
     async def release_assignment_lock(self, call_id: str):
@@ -186,22 +415,30 @@ class RedisClient:
             key = f"assignment_lock:{call_id}"
             await self.redis.delete(key)
         except Exception as e:
-            print(f"Redis release_assignment_lock error: {e}")
+            logger.warning("Redis release_assignment_lock failed: %s", e)
     
     # Metrics operations
+    # Metric names are tracked in a Redis SET so reads can enumerate them
+    # without a blocking KEYS scan over the whole keyspace
     async def increment_metric(self, metric_name: str, value: float = 1):
         """Increment a metric counter"""
         try:
-            await self.redis.incrbyfloat(f"metric:{metric_name}", value)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.sadd("metric_names", metric_name)
+            pipe.incrbyfloat(f"metric:{metric_name}", value)
+            await pipe.execute()
         except Exception as e:
-            print(f"Redis increment_metric error: {e}")
+            logger.warning("Redis increment_metric failed: %s", e)
     
     async def set_metric(self, metric_name: str, value: float):
         """Set a metric value"""
         try:
-            await self.redis.set(f"metric:{metric_name}", str(value))
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.sadd("metric_names", metric_name)
+            pipe.set(f"metric:{metric_name}", str(value))
+            await pipe.execute()
         except Exception as e:
-            print(f"Redis set_metric error: {e}")
+            logger.warning("Redis set_metric failed: %s", e)
     
     async def get_metric(self, metric_name: str) -> Optional[float]:
         """Get metric value"""
@@ -209,21 +446,21 @@ class RedisClient:
             value = await self.redis.get(f"metric:{metric_name}")
             return float(value) if value else None
         except Exception as e:
-            print(f"Redis get_metric error: {e}")
+            logger.warning("Redis get_metric failed: %s", e)
             return None
     
     async def get_all_metrics(self) -> Dict[str, float]:
         """Get all metrics"""
         try:
-            keys = await self.redis.keys("metric:*")
-            if not keys:
+            names = await self.redis.smembers("metric_names")
+            if not names:
                 return {}
             
-            values = await self.redis.mget(keys)
+            names = sorted(names)
+            values = await self.redis.mget([f"metric:{name}" for name in names])
             metrics = {}
             
-            for key, value in zip(keys, values):
-                metric_name = key.replace("metric:", "")
+            for metric_name, value in zip(names, values):
                 try:
                     metrics[metric_name] = float(value) if value else 0.0
                 except (ValueError, TypeError):
@@ -231,7 +468,7 @@ class RedisClient:
             
             return metrics
         except Exception as e:
-            print(f"Redis get_all_metrics error: {e}")
+            logger.warning("Redis get_all_metrics failed: %s", e)
             return {}
     
     # System operations
@@ -248,7 +485,7 @@ class RedisClient:
         try:
             await self.redis.flushdb()
         except Exception as e:
-            print(f"Redis clear_all_data error: {e}")
+            logger.warning("Redis clear_all_data failed: %s", e)
 
 # Global Redis instance
 redis_client = RedisClient()
\ No newline at end of file
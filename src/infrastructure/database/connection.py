@@ -1,5 +1,6 @@
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -12,36 +13,91 @@ class DatabaseConnection:
     def __init__(self):
         self.engine = None
         self.async_session_factory = None
+        self.async_read_session_factory = None
     
     async def initialize(self):
-        """Initialize database connection and create tables"""
-        self.engine = create_async_engine(
-            settings.database_url,
-            echo=False,  # Set to True for SQL logging
-            pool_size=20,
-            max_overflow=30,
-            pool_pre_ping=True,
-            pool_recycle=3600
-        )
+        """Initialize database connection and create tables (idempotent)"""
+        if self.engine is not None:
+            return
         
+        if settings.db_behind_pgbouncer:
+            # PgBouncer owns pooling: no app-side pool, and asyncpg must
+            # not cache prepared statements across transaction-mode
+            # connection reuse
+            self.engine = create_async_engine(
+                settings.database_url,
+                echo=False,
+                poolclass=NullPool,
+                # Room for every distinct statement shape the
+                # repositories emit, so hot paths never recompile
+                query_cache_size=1200,
+                connect_args={
+                    "statement_cache_size": 0,
+                    "prepared_statement_cache_size": 0
+                }
+            )
+        else:
+            self.engine = create_async_engine(
+                settings.database_url,
+                echo=False,  # Set to True for SQL logging
+                poolclass=AsyncAdaptedQueuePool,
+                query_cache_size=1200,
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
+                pool_timeout=settings.db_pool_timeout,
+                pool_pre_ping=settings.db_pool_pre_ping,
+                pool_recycle=3600
+            )
+
+            # Guard against a sync pool sneaking in (it would block the event loop)
+            assert isinstance(self.engine.pool, AsyncAdaptedQueuePool)
+
         self.async_session_factory = async_sessionmaker(
             self.engine,
             class_=AsyncSession,
             expire_on_commit=False
         )
+        # Read sessions never flush; skipping autoflush avoids the dirty
+        # scan before every SELECT
+        self.async_read_session_factory = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False
+        )
         
-        # Create tables
-        async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        # Create tables unless the schema is managed out of band. The
+        # advisory lock serializes concurrent replicas cold-starting at
+        # once so only one of them runs the DDL probes.
+        if settings.db_auto_create_tables:
+            async with self.engine.begin() as conn:
+                await conn.execute(text("SELECT pg_advisory_xact_lock(721804)"))
+                await conn.run_sync(Base.metadata.create_all)
+    
+    def pool_status(self) -> str:
+        """Human-readable pool state for tuning (see /debug/pool)"""
+        if not self.engine:
+            return "not initialized"
+        return self.engine.pool.status()
     
     async def close(self):
         """Close database connection"""
         if self.engine:
             await self.engine.dispose()
+            self.engine = None
+            self.async_session_factory = None
+            self.async_read_session_factory = None
     
     @asynccontextmanager
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """Get database session"""
+        """Get a writable database session (commits on success)
+
+        Sessions are scoped to a single repository operation: the close()
+        in the finally block empties the identity map and detaches every
+        loaded object, so entities handed to callers can never trigger
+        implicit refresh SELECTs later. Do not hold a session across
+        requests.
+        """
         if not self.async_session_factory:
             raise RuntimeError("Database not initialized. Call initialize() first.")
         
@@ -54,6 +110,23 @@ class DatabaseConnection:
                 raise
             finally:
                 await session.close()
+    
+    @asynccontextmanager
+    async def get_read_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Get a read-only session: skips the COMMIT round-trip
+
+        SELECT-only paths don't need a commit; rolling back is free for a
+        transaction that wrote nothing and spares Postgres the WAL flush.
+        """
+        if not self.async_read_session_factory:
+            raise RuntimeError("Database not initialized. Call initialize() first.")
+        
+        async with self.async_read_session_factory() as session:
+            try:
+                yield session
+            finally:
+                await session.rollback()
+                await session.close()
 
 # Global database instance
 db_connection = DatabaseConnection()
\ No newline at end of file
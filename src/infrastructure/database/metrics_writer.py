@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from infrastructure.database.connection import db_connection
+
+logger = logging.getLogger(__name__)
+
+# Flush whenever the buffer gets this big, or this often otherwise
+_FLUSH_THRESHOLD = 500
+_FLUSH_INTERVAL = 0.5
+
+_COLUMNS = (
+    "id",
+    "metric_name",
+    "metric_value",
+    "metric_type",
+    "agent_type",
+    "call_type",
+    "recorded_at",
+)
+
+class MetricsWriter:
+    """Buffered writer for the system_metrics table
+
+    Metrics are produced on every assignment and completion; inserting
+    them one row at a time costs a round-trip and a WAL record each.
+    record() only appends to an in-process buffer and a background task
+    flushes the whole buffer with asyncpg's COPY protocol, so each batch
+    pays for one round-trip regardless of size. Rows in a failed flush
+    are dropped with a warning rather than retried: metrics are
+    best-effort, same as the Redis counters.
+    """
+
+    def __init__(self):
+        self._buffer: List[Tuple] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    def record(self, metric_name: str, value: float, metric_type: str = "performance",
+               agent_type: Optional[str] = None, call_type: Optional[str] = None):
+        """Buffer one metric row (no I/O on the caller's path)"""
+        self._buffer.append((
+            uuid.uuid4(),
+            metric_name,
+            float(value),
+            metric_type,
+            agent_type,
+            call_type,
+            datetime.utcnow(),
+        ))
+        if len(self._buffer) >= _FLUSH_THRESHOLD:
+            self._wakeup.set()
+
+    async def start(self):
+        """Spawn the background flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Stop the flush task and drain whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._flush()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._flush()
+
+    async def _flush(self):
+        if not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+        try:
+            async with db_connection.engine.begin() as conn:
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    "system_metrics",
+                    records=records,
+                    columns=list(_COLUMNS),
+                )
+        except Exception as e:
+            logger.warning("Metrics flush failed (%d rows dropped): %s", len(records), e)
+
+# Global metrics writer instance
+metrics_writer = MetricsWriter()
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, DateTime, Float, Integer, Boolean, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, Float, Integer, Boolean, SmallInteger, Text, ForeignKey, Index, func, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from datetime import datetime
 import uuid
 
 # Import the enums from domain entities
@@ -12,35 +12,139 @@ from domain.entities.assignment import AssignmentStatus
 
 Base = declarative_base()
 
+# Single source of truth for the ORM registry: importing model classes
+# from anywhere else re-executes table definitions against Base.metadata
+# and trips duplicate-registration errors, so everything is exported here
+__all__ = [
+    "Base",
+    "StatusCode",
+    "AgentModel",
+    "CallModel",
+    "AssignmentModel",
+    "TenantModel",
+    "SystemMetricsModel",
+    "TestRunModel",
+]
+
+class StatusCode(TypeDecorator):
+    """Store a string-valued domain Enum as a SMALLINT code.
+
+    Native PG enums ship their label text over the wire on every read and
+    write; a 2-byte code compares faster in the executor and keeps heap
+    tuples and indexes smaller. Codes follow the Enum's declaration order,
+    so new members must only ever be appended. Binds accept the Enum
+    member or its value string; results come back as the value string,
+    matching what the repositories already expect.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls):
+        super().__init__()
+        self._enum_cls = enum_cls
+        self._to_code = {}
+        self._to_value = {}
+        for code, member in enumerate(enum_cls):
+            self._to_code[member] = code
+            self._to_code[member.value] = code
+            self._to_value[code] = member.value
+
+    def code(self, member) -> int:
+        """Integer code for a member, for use in raw SQL fragments"""
+        return self._to_code[member]
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._to_code[value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._to_value[value]
+
+agent_status_type = StatusCode(AgentStatus)
+call_status_type = StatusCode(CallStatus)
+qualification_result_type = StatusCode(QualificationResult)
+assignment_status_type = StatusCode(AssignmentStatus)
+
 class AgentModel(Base):
     __tablename__ = "agents"
+    __table_args__ = (
+        # Availability lookups only ever touch non-terminal statuses, so a
+        # partial index stays tiny and hot in cache
+        Index(
+            "ix_agents_status_agent_type",
+            "status",
+            "agent_type",
+            postgresql_where=text(
+                f"status IN ({agent_status_type.code(AgentStatus.AVAILABLE)}, "
+                f"{agent_status_type.code(AgentStatus.PAUSED)})"
+            )
+        ),
+        # Containment filters (capabilities @> '{...}') hit a bitmap index
+        # scan instead of reparsing every row; jsonb_path_ops keeps the
+        # index smaller than the default jsonb_ops since we only need @>
+        Index(
+            "ix_agents_capabilities_gin",
+            "capabilities",
+            postgresql_using="gin",
+            postgresql_ops={"capabilities": "jsonb_path_ops"}
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=True, default=lambda: uuid.UUID('00000000-0000-0000-0000-000000000001'))
     name = Column(String(255), nullable=False)
     agent_type = Column(String(50), nullable=False)
-    status = Column(Enum(AgentStatus, name="agent_status_enum"), nullable=False, default=AgentStatus.OFFLINE)
+    status = Column(agent_status_type, nullable=False, default=AgentStatus.OFFLINE)
     last_call_end_time = Column(DateTime(timezone=True), nullable=True)
     current_call_id = Column(UUID(as_uuid=True), nullable=True)
     capabilities = Column(JSONB, nullable=True, default=dict)  # Use JSONB type with dict default
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
-    # Relationships
-    assignments = relationship("AssignmentModel", back_populates="agent")
+    # Relationships. raise turns any accidental per-row lazy load of the
+    # (unbounded) assignments collection into an immediate error instead
+    # of a silent N+1
+    assignments = relationship("AssignmentModel", back_populates="agent", lazy="raise")
 
 class CallModel(Base):
     __tablename__ = "calls"
-    
+    __table_args__ = (
+        # Analytics filters/groupings run on calls alone once agent_type
+        # is denormalized at assignment time
+        Index("ix_calls_status_agent_type_call_type", "status", "agent_type", "call_type"),
+        # find_by_status: WHERE status = ? ORDER BY created_at DESC
+        Index("ix_calls_status_created_at", "status", text("created_at DESC")),
+        # find_completed_calls_by_types: WHERE status = 'COMPLETED'
+        # (AND call_type = ?) ORDER BY completed_at DESC
+        Index("ix_calls_status_call_type_completed_at", "status", "call_type", text("completed_at DESC")),
+        # Tenant-scoped dashboards: tenant filter + status + recency in
+        # one index. Declarative partitioning by tenant_id is the end
+        # state once a migration tool exists; create_all cannot convert a
+        # live table to a partitioned one
+        Index("ix_calls_tenant_status_created_at", "tenant_id", "status", text("created_at DESC")),
+        # @>-only GIN index for metadata containment filters
+        Index(
+            "ix_calls_call_metadata_gin",
+            "call_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"call_metadata": "jsonb_path_ops"}
+        ),
+    )
+
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=True, default=lambda: uuid.UUID('00000000-0000-0000-0000-000000000001'))
     phone_number = Column(String(50), nullable=False)
     call_type = Column(String(50), nullable=False)
-    status = Column(Enum(CallStatus, name="call_status_enum"), nullable=False, default=CallStatus.PENDING)
+    status = Column(call_status_type, nullable=False, default=CallStatus.PENDING)
     assigned_agent_id = Column(UUID(as_uuid=True), ForeignKey("agents.id"), nullable=True)
-    qualification_result = Column(Enum(QualificationResult, name="qualification_result_enum"), nullable=False, default=QualificationResult.PENDING)
+    agent_type = Column(String(50), nullable=True)  # Denormalized from the assigned agent
+    qualification_result = Column(qualification_result_type, nullable=False, default=QualificationResult.PENDING)
     priority = Column(Integer, nullable=False, default=0)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     assigned_at = Column(DateTime(timezone=True), nullable=True)
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -48,40 +152,97 @@ class CallModel(Base):
     call_metadata = Column(JSONB, nullable=True, default=dict)  # Use JSONB type with dict default
     
     # Relationships
-    assignments = relationship("AssignmentModel", back_populates="call")
+    assignments = relationship("AssignmentModel", back_populates="call", lazy="raise")
 
 class AssignmentModel(Base):
     __tablename__ = "assignments"
-    
+    __table_args__ = (
+        # Covers find_assignments_by_performance so it can run as an
+        # index-only scan over the non-null timing rows
+        Index(
+            "ix_assignments_perf_covering",
+            "assignment_time_ms",
+            postgresql_include=["id", "call_id", "agent_id", "status"],
+            postgresql_where=text("assignment_time_ms IS NOT NULL")
+        ),
+        # Active-assignment scans skip the (vastly larger) terminal rows
+        Index(
+            "ix_assignments_active",
+            "status",
+            postgresql_where=text(
+                f"status IN ({assignment_status_type.code(AssignmentStatus.PENDING)}, "
+                f"{assignment_status_type.code(AssignmentStatus.ACTIVE)})"
+            )
+        ),
+        # find_completed_assignments: keyset pages ordered by
+        # (completed_at DESC, id DESC) over the completed rows only
+        Index(
+            "ix_assignments_completed_at_id",
+            text("completed_at DESC"),
+            text("id DESC"),
+            postgresql_where=text(
+                f"status = {assignment_status_type.code(AssignmentStatus.COMPLETED)}"
+            )
+        ),
+        # find_by_agent_id filter
+        Index("ix_assignments_agent_id", "agent_id"),
+        # Tenant-scoped assignment listings
+        Index("ix_assignments_tenant_status_created_at", "tenant_id", "status", text("created_at DESC")),
+        # @>-only GIN index for metadata containment filters
+        Index(
+            "ix_assignments_assignment_metadata_gin",
+            "assignment_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"assignment_metadata": "jsonb_path_ops"}
+        ),
+    )
+
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=True, default=lambda: uuid.UUID('00000000-0000-0000-0000-000000000001'))
     call_id = Column(UUID(as_uuid=True), ForeignKey("calls.id"), nullable=False)
     agent_id = Column(UUID(as_uuid=True), ForeignKey("agents.id"), nullable=False)
-    status = Column(Enum(AssignmentStatus, name="assignment_status_enum"), nullable=False, default=AssignmentStatus.PENDING)
+    status = Column(assignment_status_type, nullable=False, default=AssignmentStatus.PENDING)
     assignment_time_ms = Column(Float, nullable=True)
     expected_duration_seconds = Column(Float, nullable=True)
     actual_duration_seconds = Column(Float, nullable=True)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     activated_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     assignment_metadata = Column(JSONB, nullable=True, default=dict)  # Use JSONB type with dict default
     
-    # Relationships
-    call = relationship("CallModel", back_populates="assignments")
-    agent = relationship("AgentModel", back_populates="assignments")
+    # Relationships. Nothing traverses these today (entities are built
+    # from the scalar FK columns), so raise keeps accidental lazy loads
+    # loud instead of paying two batched SELECTs on every assignment
+    # read; callers that need the traversal opt in with selectinload()
+    call = relationship("CallModel", back_populates="assignments", lazy="raise")
+    agent = relationship("AgentModel", back_populates="assignments", lazy="raise")
 
 class TenantModel(Base):
     __tablename__ = "tenants"
+    __table_args__ = (
+        # @>-only GIN index for configuration containment filters
+        Index(
+            "ix_tenants_configuration_gin",
+            "configuration",
+            postgresql_using="gin",
+            postgresql_ops={"configuration": "jsonb_path_ops"}
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False, unique=True)
+    tier = Column(String(50), nullable=False, default="standard")  # Promoted from configuration JSONB
     configuration = Column(JSONB, nullable=True, default=dict)  # Use JSONB type with dict default
     is_active = Column(Boolean, nullable=False, default=True)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
 class SystemMetricsModel(Base):
     __tablename__ = "system_metrics"
+    __table_args__ = (
+        # Tenant-scoped metric reads over a time window
+        Index("ix_system_metrics_tenant_recorded_at", "tenant_id", text("recorded_at DESC")),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=True)
@@ -90,7 +251,7 @@ class SystemMetricsModel(Base):
     metric_type = Column(String(50), nullable=False)  # assignment, qualification, performance
     agent_type = Column(String(50), nullable=True)
     call_type = Column(String(50), nullable=True)
-    recorded_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    recorded_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     metrics_metadata = Column(JSONB, nullable=True, default=dict)  # Use JSONB type with dict default
 
 class TestRunModel(Base):
@@ -102,7 +263,7 @@ class TestRunModel(Base):
     num_agents = Column(Integer, nullable=False)
     call_duration_mean = Column(Float, nullable=False)
     call_duration_std = Column(Float, nullable=False)
-    started_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
     status = Column(String(20), nullable=False, default="RUNNING")
     results_summary = Column(Text, nullable=True)  # JSON string with results
@@ -23,6 +23,11 @@ import asyncio
 import click
 import logging
 import uvicorn
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is in requirements on Linux
+    uvloop = None
 from datetime import datetime
 import json
 import sys
@@ -35,6 +40,7 @@ from config.settings import settings
 from application.test_runner import TestRunner
 from application.event_generator import EventGenerator
 from infrastructure.database.connection import db_connection
+from infrastructure.database.metrics_writer import metrics_writer
 from infrastructure.cache.redis_client import redis_client
 
 # Configure logging
@@ -46,15 +52,34 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def _run(coro):
+    """asyncio.run with uvloop installed when available
+
+    The load and test runners schedule thousands of timer tasks; uvloop's
+    C scheduler cuts the per-task cost versus the stdlib loop.
+    """
+    if uvloop is not None:
+        uvloop.install()
+    asyncio.run(coro)
+
 async def initialize_system():
-    """Initialize database and Redis connections"""
+    """Initialize database and Redis connections
+
+    Both initializers are idempotent, so subcommands composed in one
+    process (or test code driving several runners) reuse the already
+    open pools instead of paying the TCP/auth handshake again.
+    """
     logger.info("Initializing Call Assignment System...")
     
     try:
         # Initialize database
         await db_connection.initialize()
         logger.info("✅ Database initialized")
-        
+
+        # Start the buffered metrics writer (flushed via COPY)
+        await metrics_writer.start()
+        logger.info("✅ Metrics writer started")
+
         # Initialize Redis
         await redis_client.initialize()
         logger.info("✅ Redis initialized")
@@ -70,6 +95,8 @@ async def shutdown_system():
     logger.info("Shutting down Call Assignment System...")
     
     try:
+        # Flush buffered metrics before the pool goes away
+        await metrics_writer.close()
         await db_connection.close()
         await redis_client.close()
         logger.info("✅ System shutdown complete")
@@ -86,18 +113,36 @@ def cli():
 @click.option('--host', default=settings.api_host, help='Host to bind to')
 @click.option('--port', default=settings.api_port, help='Port to bind to')
 @click.option('--reload', is_flag=True, help='Enable auto-reload for development')
-def api(host, port, reload):
+@click.option('--workers', type=int, default=1,
+              help='Worker processes (default 1; see --workers caveat below)')
+def api(host, port, reload, workers):
     """Start the API server"""
-    click.echo(f"🚀 Starting Call Assignment API on {host}:{port}")
+    # Multi-worker is opt-in, not the default: the orchestrator keeps
+    # active_assignments and call_timers in process-local dicts, so with
+    # N workers a completion timer or DELETE for a call owned by another
+    # worker does nothing. Until that state moves to Redis, more than
+    # one worker is only safe for read-mostly load testing.
+    if reload and workers != 1:
+        click.echo("⚠️  --reload supports a single process; forcing workers=1")
+        workers = 1
+    if workers > 1:
+        click.echo("⚠️  Multiple workers: per-call timers/cancellation are per-worker")
+    
+    click.echo(f"🚀 Starting Call Assignment API on {host}:{port} ({workers} worker(s))")
     
     # Import here to avoid circular imports
     from infrastructure.api.rest_api import app
     
+    # uvloop + httptools: C event loop and HTTP parser, 2-4x lower
+    # per-request overhead than the stdlib loop + h11 on Linux
     uvicorn.run(
         "infrastructure.api.rest_api:app",
         host=host,
         port=port,
         reload=reload,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
 
@@ -108,7 +153,7 @@ def api(host, port, reload):
 @click.option('--agents', type=int, help='Number of agents to generate')
 def test(quick, stress, calls, agents):
     """Run test suite"""
-    asyncio.run(_run_test(quick, stress, calls, agents))
+    _run(_run_test(quick, stress, calls, agents))
 
 async def _run_test(quick, stress, calls, agents):
     """Internal test runner"""
@@ -145,7 +190,7 @@ async def _run_test(quick, stress, calls, agents):
 @click.option('--agents', default=20, help='Number of agents')
 def load(duration, calls_per_minute, agents):
     """Run load test"""
-    asyncio.run(_run_load_test(duration, calls_per_minute, agents))
+    _run(_run_load_test(duration, calls_per_minute, agents))
 
 async def _run_load_test(duration, calls_per_minute, agents):
     """Internal load test runner"""
@@ -188,7 +233,7 @@ async def _run_load_test(duration, calls_per_minute, agents):
 @cli.command()
 def status():
     """Show system status"""
-    asyncio.run(_show_status())
+    _run(_show_status())
 
 async def _show_status():
     """Internal status display"""
@@ -239,7 +284,7 @@ async def _show_status():
 @cli.command()
 def cleanup():
     """Clean up test data"""
-    asyncio.run(_cleanup())
+    _run(_cleanup())
 
 async def _cleanup():
     """Internal cleanup"""
@@ -260,7 +305,7 @@ async def _cleanup():
 @cli.command()
 def demo():
     """Run a demonstration of the system"""
-    asyncio.run(_run_demo())
+    _run(_run_demo())
 
 async def _run_demo():
     """Run a demonstration"""
@@ -9,14 +9,14 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from domain.entities.agent import Agent, AgentStatus
 from domain.entities.call import Call, CallStatus
 from domain.entities.assignment import Assignment, AssignmentStatus
-from domain.services.assignment_service import AssignmentService, LongestIdleTimeStrategy
+from domain.services.assignment_service import AssignmentService, LongestIdleTimeStrategy, HeapIdleTimeStrategy
 
 class TestAssignmentService:
     """Test cases for assignment service"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def assignment_service(self):
-        """Create assignment service instance"""
+        """Create assignment service instance (stateless, shared per module)"""
         return AssignmentService(LongestIdleTimeStrategy())
     
     @pytest.fixture
@@ -190,7 +190,7 @@ class TestAssignmentService:
 class TestLongestIdleTimeStrategy:
     """Test cases for longest idle time strategy"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def strategy(self):
         """Create strategy instance"""
         return LongestIdleTimeStrategy()
@@ -250,6 +250,39 @@ class TestLongestIdleTimeStrategy:
         assert selected_agent is not None
         assert selected_agent.id == "never"
 
+class TestHeapIdleTimeStrategy:
+    """Test cases for the heap-backed longest idle time strategy"""
+
+    def test_agent_reappears_after_pause_resume(self):
+        """Test that a paused agent is selectable again once it resumes
+
+        Regression test: the heap entry for an unavailable agent is
+        dropped on pop, and the agent must be re-pushed when it comes
+        back with the same last_call_end_time.
+        """
+        # Local instance: the strategy is stateful across select_agent calls
+        strategy = HeapIdleTimeStrategy()
+
+        agent = Agent(
+            id="agent-1",
+            name="Agent 1",
+            agent_type="agente_tipo_1",
+            status=AgentStatus.AVAILABLE
+        )
+        agent.last_call_end_time = datetime(2023, 1, 1, 12, 0, 0)
+        call = Call(phone_number="+1555000001", call_type="llamada_tipo_1")
+
+        # Available: selected
+        assert strategy.select_agent([agent], call) is agent
+
+        # Paused: not selectable
+        agent.status = AgentStatus.PAUSED
+        assert strategy.select_agent([agent], call) is None
+
+        # Resumed with the same last_call_end_time: selectable again
+        agent.status = AgentStatus.AVAILABLE
+        assert strategy.select_agent([agent], call) is agent
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v"])
\ No newline at end of file
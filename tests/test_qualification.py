@@ -15,9 +15,14 @@ from config.settings import settings
 class TestQualificationService:
     """Test cases for qualification service"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def qualification_service(self):
-        """Create qualification service with test conversion matrix"""
+        """Create qualification service with test conversion matrix
+
+        Module-scoped: the service is read-only in these tests (tests
+        that need their own RNG construct a local instance), so the
+        matrix encoding work runs once instead of per test.
+        """
         test_matrix = {
             "agente_tipo_1": {
                 "llamada_tipo_1": 0.30,
@@ -59,20 +64,20 @@ class TestQualificationService:
         assert isinstance(result, QualificationResult)
         assert result in [QualificationResult.OK, QualificationResult.KO]
     
+    @pytest.mark.slow
     def test_qualify_call_probability_distribution(self, qualification_service):
         """Test that qualification follows expected probability distribution"""
         agent_type = "agente_tipo_1"
         call_type = "llamada_tipo_1"
         expected_probability = 0.30
         
-        # Run many qualifications to test probability
+        # One vectorized batch instead of 10k scalar calls: exercises
+        # the production bulk-qualification path and runs in one draw
         num_trials = 10000
-        ok_count = 0
-        
-        for _ in range(num_trials):
-            result = qualification_service.qualify_call(agent_type, call_type)
-            if result == QualificationResult.OK:
-                ok_count += 1
+        results = qualification_service.qualify_calls_batch(
+            [agent_type] * num_trials, [call_type] * num_trials
+        )
+        ok_count = sum(1 for result in results if result == QualificationResult.OK)
         
         actual_probability = ok_count / num_trials
         
@@ -80,21 +85,25 @@ class TestQualificationService:
         tolerance = 0.05
         assert abs(actual_probability - expected_probability) <= tolerance
     
+    @pytest.mark.slow
     def test_generate_duration_normal_distribution(self, qualification_service):
         """Test that duration generation follows normal distribution"""
         mean_seconds = 180.0
         std_seconds = 60.0
         
-        durations = []
-        for _ in range(1000):
-            duration = qualification_service.generate_duration(mean_seconds, std_seconds)
-            durations.append(duration)
-            # Ensure minimum duration constraint
-            assert duration >= 1.0
+        # Preallocated buffer: no append-grown list and no list->array
+        # conversion before the reductions
+        n = 1000
+        durations = np.empty(n)
+        for i in range(n):
+            durations[i] = qualification_service.generate_duration(mean_seconds, std_seconds)
+        
+        # Ensure minimum duration constraint
+        assert (durations >= 1.0).all()
         
         # Test statistical properties
-        actual_mean = np.mean(durations)
-        actual_std = np.std(durations)
+        actual_mean = durations.mean()
+        actual_std = durations.std()
         
         # Allow for statistical variance (±10% tolerance)
         assert abs(actual_mean - mean_seconds) <= mean_seconds * 0.1
@@ -188,26 +197,25 @@ class TestQualificationService:
                 prob = settings.conversion_matrix[agent_type][call_type]
                 assert 0 <= prob <= 1
     
-    def test_qualification_consistency(self, qualification_service):
+    def test_qualification_consistency(self):
         """Test that qualification is deterministic for same random seed"""
-        # Set random seed for reproducibility
-        qualification_service.random_generator = np.random.default_rng(seed=42)
-        
-        results1 = []
-        for _ in range(10):
-            result = qualification_service.qualify_call("agente_tipo_1", "llamada_tipo_1")
-            results1.append(result)
+        test_matrix = {"agente_tipo_1": {"llamada_tipo_1": 0.30}}
+        n = 10
+        agent_codes = np.zeros(n, dtype=np.intp)
+        call_codes = np.zeros(n, dtype=np.intp)
         
-        # Reset with same seed
-        qualification_service.random_generator = np.random.default_rng(seed=42)
+        # Two identically seeded services drawing through the coded
+        # batch API must produce identical boolean verdicts
+        service1 = QualificationService(test_matrix)
+        service1.random_generator = np.random.default_rng(seed=42)
+        results1 = service1.qualify_calls_coded(agent_codes, call_codes)
         
-        results2 = []
-        for _ in range(10):
-            result = qualification_service.qualify_call("agente_tipo_1", "llamada_tipo_1")
-            results2.append(result)
+        service2 = QualificationService(test_matrix)
+        service2.random_generator = np.random.default_rng(seed=42)
+        results2 = service2.qualify_calls_coded(agent_codes, call_codes)
         
         # Results should be identical
-        assert results1 == results2
+        assert np.array_equal(results1, results2)
 
 class CallMock:
     """Mock call class for testing"""
@@ -223,12 +231,27 @@ class TestQualificationIntegration:
         """Test qualification for all agent/call type combinations"""
         service = QualificationService(settings.conversion_matrix)
         
-        # Test each combination generates valid results
-        for agent_type in settings.agent_types:
-            for call_type in settings.call_types:
-                result = service.qualify_call(agent_type, call_type)
-                assert isinstance(result, QualificationResult)
-                assert result in [QualificationResult.OK, QualificationResult.KO]
+        # Precompute the full type product once and qualify it through
+        # the coded batch API in a single vectorized call
+        pairs = [
+            (agent_type, call_type)
+            for agent_type in settings.agent_types
+            for call_type in settings.call_types
+        ]
+        agent_codes = service.encode_agent_types([agent_type for agent_type, _ in pairs])
+        call_codes = service.encode_call_types([call_type for _, call_type in pairs])
+        
+        # Every configured combination should encode to a known code
+        assert (agent_codes >= 0).all()
+        assert (call_codes >= 0).all()
+        
+        ok_mask = service.qualify_calls_coded(agent_codes, call_codes)
+        
+        # One boolean verdict per combination, convertible to results
+        assert len(ok_mask) == len(pairs)
+        for is_ok in ok_mask:
+            result = QualificationResult.OK if is_ok else QualificationResult.KO
+            assert result in [QualificationResult.OK, QualificationResult.KO]
     
     def test_expected_conversion_rates(self):
         """Test that conversion rates match expected values from settings"""
@@ -245,6 +268,7 @@ class TestQualificationIntegration:
             actual_rate = service.calculate_expected_conversion_rate(agent_type, call_type)
             assert actual_rate == expected_rate
     
+    @pytest.mark.slow
     def test_realistic_qualification_simulation(self):
         """Test qualification with realistic parameters"""
         service = QualificationService(settings.conversion_matrix)